@@ -1,10 +1,33 @@
+import asyncio
 import json
 import logging
-from typing import Any, Optional
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import cached_property, partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
 
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, Limits, Response, Timeout
 
-from .response import Response as GreenAPIResponse
+from .breaker import CircuitBreaker
+from .concurrency import SingleFlight
+from .metadata import MetadataCache
+from .metrics import Instrument, RequestUsage
+from .response import Response as GreenAPIResponse, iter_json_array, loads
+from .retry import RequestAttempt, RetryPolicy, _UNSET, retry_override
+from .routes import READ_ONLY_METHODS, Routes, method_name
+from .uploads import UploadCache
 from .tools import (
     account,
     device,
@@ -25,6 +48,10 @@ class AsyncGreenApi:
     id_instance: str
     api_token_instance: str
 
+    _route_attributes = frozenset({
+        "host", "media", "id_instance", "api_token_instance"
+    })
+
     def __init__(
             self,
             id_instance: str,
@@ -32,112 +59,494 @@ class AsyncGreenApi:
             debug_mode: bool = False,
             raise_errors: bool = False,
             host: str = "https://api.green-api.com",
-            media: str = "https://media.green-api.com"
+            media: str = "https://media.green-api.com",
+            session: Optional[AsyncClient] = None,
+            http2: bool = False,
+            max_connections: Optional[int] = 100,
+            max_keepalive_connections: Optional[int] = 20,
+            keepalive_expiry: Optional[float] = 5.0,
+            connect_timeout: Optional[float] = 5.0,
+            read_timeout: Optional[float] = 5.0,
+            write_timeout: Optional[float] = 5.0,
+            pool_timeout: Optional[float] = 5.0,
+            log_body_limit: Optional[int] = 10000,
+            upload_cache: Optional[UploadCache] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            instruments: Optional[Iterable[Instrument]] = None,
+            coalesce: bool = True
     ):
+        self.routes = Routes(self)
+
         self.host = host
         self.media = media
         self.debug_mode = debug_mode
         self.raise_errors = raise_errors
+        self.log_body_limit = log_body_limit
+        self.upload_cache = upload_cache
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.attempt_hooks: List[Callable[[RequestAttempt], Any]] = []
+        self.instruments: List[Instrument] = list(instruments or ())
+        self.coalesce = coalesce
+        # The number of requests that shared the response of an identical
+        # request in flight by API method.
+        self.coalesced: Counter = Counter()
+        self._in_flight: SingleFlight[GreenAPIResponse] = SingleFlight()
 
         self.id_instance = id_instance
         self.api_token_instance = api_token_instance
 
-        self.session = AsyncClient()
-        self.account = account.Account(self)
-        self.device = device.Device(self)
-        self.groups = groups.Groups(self)
-        self.journals = journals.Journals(self)
-        self.marking = marking.Marking(self)
-        self.queues = queues.Queues(self)
-        self.receiving = receiving.Receiving(self)
-        self.sending = sending.Sending(self)
-        self.service_methods = serviceMethods.ServiceMethods(self)
-        self.webhooks = webhooks.Webhooks(self)
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(
+                http2,
+                max_connections,
+                max_keepalive_connections,
+                keepalive_expiry,
+                connect_timeout,
+                read_timeout,
+                write_timeout,
+                pool_timeout
+            )
+        self.session = session
 
         self.logger = logging.getLogger("whatsapp-api-client-python")
         self.__prepare_logger()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+
+        if name in self._route_attributes:
+            self.routes.clear()
+
+    @cached_property
+    def account(self) -> account.Account:
+        return account.Account(self)
+
+    @cached_property
+    def device(self) -> device.Device:
+        return device.Device(self)
+
+    @cached_property
+    def groups(self) -> groups.Groups:
+        return groups.Groups(self)
+
+    @cached_property
+    def journals(self) -> journals.Journals:
+        return journals.Journals(self)
+
+    @cached_property
+    def marking(self) -> marking.Marking:
+        return marking.Marking(self)
+
+    @cached_property
+    def queues(self) -> queues.Queues:
+        return queues.Queues(self)
+
+    @cached_property
+    def receiving(self) -> receiving.Receiving:
+        return receiving.Receiving(self)
+
+    @cached_property
+    def sending(self) -> sending.Sending:
+        return sending.Sending(self)
+
+    @cached_property
+    def service_methods(self) -> serviceMethods.ServiceMethods:
+        return serviceMethods.ServiceMethods(self)
+
+    @cached_property
+    def webhooks(self) -> webhooks.Webhooks:
+        return webhooks.Webhooks(self)
+
+    @cached_property
+    def metadata(self) -> MetadataCache:
+        """
+        The cache of contacts and group data, it is invalidated by the
+        notifications received by the client once it is used.
+        """
+
+        metadata = MetadataCache(self)
+        self.webhooks.notification_hooks.append(metadata.handle_notification)
+
+        return metadata
+
+    async def close(self) -> None:
+        """
+        Closes the connection pool unless it was passed in by the caller
+        and may be used by other instances.
+        """
+
+        if self._owns_session:
+            await self.session.aclose()
+
+    async def __aenter__(self) -> "AsyncGreenApi":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
     async def request(
             self,
             method: str,
             url: str,
             payload: Optional[dict] = None,
-            files: Optional[dict] = None
+            files: Optional[dict] = None,
+            retry_policy: Optional[RetryPolicy] = _UNSET
     ) -> GreenAPIResponse:
-        url = url.replace("{{host}}", self.host)
-        url = url.replace("{{media}}", self.media)
-        url = url.replace("{{id_instance}}", self.id_instance)
-        url = url.replace("{{api_token_instance}}", self.api_token_instance)
-
-        try:
-            if not files:
-                response = await self.session.request(
-                    method=method, url=url, json=payload
-                )
-            else:
-                response = await self.session.request(
-                    method=method, url=url, data=payload, files=files
+        if "{{" in url:
+            url = url.replace("{{host}}", self.host)
+            url = url.replace("{{media}}", self.media)
+            url = url.replace("{{id_instance}}", self.id_instance)
+            url = url.replace("{{api_token_instance}}", self.api_token_instance)
+
+        if self.coalesce and not files:
+            api_method = method_name(url)
+            if api_method in READ_ONLY_METHODS:
+                return await self.__coalesced(
+                    api_method, method, url, payload, retry_policy
                 )
-        except Exception as error:
-            error_message = f"Request was failed with error: {error}."
 
-            if self.raise_errors:
-                raise GreenAPIError(error_message)
-            self.logger.log(logging.CRITICAL, error_message)
+        return await self.__request(method, url, payload, files, retry_policy)
 
-            return GreenAPIResponse(None, error_message)
+    async def __coalesced(
+            self,
+            api_method: str,
+            method: str,
+            url: str,
+            payload: Optional[dict],
+            retry_policy: Optional[RetryPolicy]
+    ) -> GreenAPIResponse:
+        key = (
+            method,
+            url,
+            json.dumps(payload, sort_keys=True, default=str) if payload else None
+        )
 
-        await self.__handle_response(response)
+        if key in self._in_flight:
+            self.coalesced[api_method] += 1
 
-        return GreenAPIResponse(response.status_code, response.text)
+        return await self._in_flight.run(
+            key, lambda: self.__request(method, url, payload, None, retry_policy)
+        )
 
-    async def raw_request(self, **arguments: Any) -> GreenAPIResponse:
+    async def __request(
+            self,
+            method: str,
+            url: str,
+            payload: Optional[dict],
+            files: Optional[dict],
+            retry_policy: Optional[RetryPolicy]
+    ) -> GreenAPIResponse:
+        if retry_policy is _UNSET:
+            retry_policy = retry_override.get()
+            if retry_policy is _UNSET:
+                retry_policy = self.retry_policy
+        if files:
+            # File objects are consumed by the first attempt.
+            retry_policy = None
+
+        circuit_breaker = self.circuit_breaker
+        instruments = self.instruments
+
+        api_method = None
+        if (
+                retry_policy is not None
+                or circuit_breaker is not None
+                or instruments
+                or self.attempt_hooks
+        ):
+            api_method = method_name(url)
+
+        if circuit_breaker is not None and api_method is not None:
+            if not await circuit_breaker.allow(self, api_method):
+                return self.__circuit_open(api_method)
+
+        if not instruments:
+            response, error = await self.__send(
+                method, url, payload, files, retry_policy, api_method
+            )
+        else:
+            response, error = await self.__instrumented(api_method, partial(
+                self.__send, method, url, payload, files, retry_policy, api_method
+            ))
+
+        if circuit_breaker is not None and api_method is not None:
+            circuit_breaker.record(
+                self.id_instance,
+                api_method,
+                response.status_code if response is not None else None,
+                error
+            )
+
+        if error is not None:
+            return self.handle_error(f"Request was failed with error: {error}.")
+
+        result = GreenAPIResponse(response.status_code, response.content)
+
+        await self.__handle_response(result)
+
+        return result
+
+    async def stream_request(
+            self, method: str, url: str, payload: Optional[dict] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Sends the request and yields the items of the JSON array of the
+        response as they are received, without reading the whole body.
+        Requests are not retried, as items may already have been
+        yielded. Errors are handled as by request and end the iteration.
+        """
+
+        if "{{" in url:
+            url = url.replace("{{host}}", self.host)
+            url = url.replace("{{media}}", self.media)
+            url = url.replace("{{id_instance}}", self.id_instance)
+            url = url.replace("{{api_token_instance}}", self.api_token_instance)
+
+        circuit_breaker = self.circuit_breaker
+
+        api_method = None
+        if circuit_breaker is not None:
+            api_method = method_name(url)
+            if not await circuit_breaker.allow(self, api_method):
+                self.__circuit_open(api_method)
+                return
+
+        status_code, error, result = None, None, None
         try:
-            response = await self.session.request(**arguments)
-        except Exception as error:
-            error_message = f"Request was failed with error: {error}."
+            async with self.session.stream(method, url, json=payload) as response:
+                status_code = response.status_code
+                if status_code != 200:
+                    await response.aread()
+                    result = GreenAPIResponse(status_code, response.content)
+                else:
+                    async for item in iter_json_array(response.aiter_bytes()):
+                        yield item
+        except Exception as exception:
+            error = exception
+        finally:
+            # The iteration may also be stopped by the caller.
+            if circuit_breaker is not None:
+                circuit_breaker.record(self.id_instance, api_method, status_code, error)
+
+        if error is not None:
+            self.handle_error(f"Request was failed with error: {error}.")
+        elif result is not None:
+            await self.__handle_response(result)
+
+    @contextmanager
+    def retrying(self, retry_policy: Optional[RetryPolicy]) -> Iterator[None]:
+        """
+        Overrides the retry policy of the requests made in the context,
+        None disables retries. For example, to retry a message send on
+        server errors:
+
+            with api.retrying(RetryPolicy(methods={"sendMessage"})):
+                await api.sending.send_message(chat_id, message)
+        """
+
+        token = retry_override.set(retry_policy)
+        try:
+            yield
+        finally:
+            retry_override.reset(token)
 
-            if self.raise_errors:
-                raise GreenAPIError(error_message)
-            self.logger.log(logging.CRITICAL, error_message)
+    async def raw_request(self, **arguments: Any) -> GreenAPIResponse:
+        circuit_breaker = self.circuit_breaker
+        instruments = self.instruments
+
+        api_method = None
+        if circuit_breaker is not None or instruments:
+            api_method = method_name(str(arguments.get("url", "")))
+
+        if circuit_breaker is not None and api_method is not None:
+            if not await circuit_breaker.allow(self, api_method):
+                return self.__circuit_open(api_method)
+
+        if not instruments:
+            response, error = await self.__send_raw(arguments)
+        else:
+            response, error = await self.__instrumented(
+                api_method, partial(self.__send_raw, arguments)
+            )
+
+        if circuit_breaker is not None and api_method is not None:
+            circuit_breaker.record(
+                self.id_instance,
+                api_method,
+                response.status_code if response is not None else None,
+                error
+            )
 
-            return GreenAPIResponse(None, error_message)
+        if error is not None:
+            return self.handle_error(f"Request was failed with error: {error}.")
 
-        await self.__handle_response(response)
+        result = GreenAPIResponse(response.status_code, response.content)
 
-        return GreenAPIResponse(response.status_code, response.text)
+        await self.__handle_response(result)
 
-    async def __handle_response(self, response: Response) -> None:
-        status_code = response.status_code
-        if status_code != 200 or self.debug_mode:
+        return result
+
+    async def __send(
+            self,
+            method: str,
+            url: str,
+            payload: Optional[dict],
+            files: Optional[dict],
+            retry_policy: Optional[RetryPolicy],
+            api_method: Optional[str],
+            usage: Optional[RequestUsage] = None
+    ) -> Tuple[Optional[Response], Optional[Exception]]:
+        extensions = usage.extensions if usage is not None else None
+
+        attempt = 0
+        while True:
+            response, error = None, None
+
+            if usage is not None:
+                usage.begin()
+
+            started = time.perf_counter()
             try:
-                data = json.dumps(
-                    json.loads(response.text), ensure_ascii=False, indent=4
+                if not files:
+                    response = await self.session.request(
+                        method=method, url=url, json=payload, extensions=extensions
+                    )
+                else:
+                    response = await self.session.request(
+                        method=method,
+                        url=url,
+                        data=payload,
+                        files=files,
+                        extensions=extensions
+                    )
+            except Exception as exception:
+                error = exception
+            elapsed = time.perf_counter() - started
+
+            if usage is not None:
+                usage.add(response, error)
+
+            status_code = response.status_code if response is not None else None
+
+            delay = None
+            if (
+                    retry_policy is not None
+                    and attempt + 1 < retry_policy.attempts
+                    and retry_policy.retryable(api_method, status_code, error)
+            ):
+                delay = retry_policy.delay(
+                    attempt,
+                    response.headers.get("Retry-After") if response is not None else None
                 )
 
-            except json.decoder.JSONDecodeError:
-                data = response.text
+            for hook in self.attempt_hooks:
+                hook(RequestAttempt(
+                    api_method, attempt, status_code, error, elapsed, delay
+                ))
+
+            if delay is None:
+                return response, error
+
+            await asyncio.sleep(delay)
+            attempt += 1
 
-                if not data and status_code == 401:
-                    data = "Unauthorized"
+    async def __send_raw(
+            self, arguments: Dict[str, Any], usage: Optional[RequestUsage] = None
+    ) -> Tuple[Optional[Response], Optional[Exception]]:
+        if usage is not None:
+            arguments = {
+                **arguments,
+                "extensions": {**arguments.get("extensions", {}), **usage.extensions}
+            }
+            usage.begin()
 
-            if status_code != 200:
-                error_message = (
+        response, error = None, None
+        try:
+            response = await self.session.request(**arguments)
+        except Exception as exception:
+            error = exception
+
+        if usage is not None:
+            usage.add(response, error)
+
+        return response, error
+
+    async def __instrumented(
+            self,
+            api_method: Optional[str],
+            send: Callable[[RequestUsage], Awaitable[Tuple[Optional[Response], Optional[Exception]]]]
+    ) -> Tuple[Optional[Response], Optional[Exception]]:
+        instruments = self.instruments
+        usage = RequestUsage()
+
+        for instrument in instruments:
+            instrument.started(self.id_instance, api_method)
+        try:
+            return await send(usage)
+        except BaseException as exception:
+            usage.add(None, exception)
+            raise
+        finally:
+            metrics = usage.metrics(self.id_instance, api_method)
+            for instrument in instruments:
+                instrument.finished(metrics)
+
+    def handle_error(self, error_message: str) -> GreenAPIResponse:
+        """
+        Raises the error if raise_errors is set, otherwise logs it and
+        returns it as a response without a status code.
+        """
+
+        if self.raise_errors:
+            raise GreenAPIError(error_message)
+        self.logger.log(logging.CRITICAL, error_message)
+
+        return GreenAPIResponse(None, error_message)
+
+    def __circuit_open(self, api_method: str) -> GreenAPIResponse:
+        return self.handle_error(
+            f"Request was not sent, the circuit of {api_method}"
+            f" of instance {self.id_instance} is open."
+        )
+
+    async def __handle_response(self, response: GreenAPIResponse) -> None:
+        status_code = response.code
+        if status_code != 200:
+            data = LoggedBody(response, self.log_body_limit)
+
+            if self.raise_errors:
+                raise GreenAPIError(
                     f"Request was failed with status code: {status_code}."
                     f" Data: {data}"
                 )
+            self.logger.log(
+                logging.ERROR,
+                "Request was failed with status code: %s. Data: %s",
+                status_code, data
+            )
 
-                if self.raise_errors:
-                    raise GreenAPIError(error_message)
-                self.logger.log(logging.ERROR, error_message)
-
-                return None
+            return None
 
+        if self.debug_mode and self.logger.isEnabledFor(logging.DEBUG):
             self.logger.log(
-                logging.DEBUG, f"Request was successful with data: {data}"
+                logging.DEBUG,
+                "Request was successful with data: %s",
+                LoggedBody(response, self.log_body_limit)
             )
 
     def __prepare_logger(self) -> None:
+        if not self.logger.handlers:
+            self.__add_handler()
+
+        if not self.debug_mode:
+            self.logger.setLevel(logging.INFO)
+        else:
+            self.logger.setLevel(logging.DEBUG)
+
+    def __add_handler(self) -> None:
         handler = logging.StreamHandler()
         handler.setFormatter(logging.Formatter(
             (
@@ -148,10 +557,69 @@ class AsyncGreenApi:
 
         self.logger.addHandler(handler)
 
-        if not self.debug_mode:
-            self.logger.setLevel(logging.INFO)
-        else:
-            self.logger.setLevel(logging.DEBUG)
+
+def create_session(
+        http2: bool = False,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 5.0,
+        write_timeout: Optional[float] = 5.0,
+        pool_timeout: Optional[float] = 5.0
+) -> AsyncClient:
+    return AsyncClient(
+        http2=http2,
+        limits=Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout
+        )
+    )
+
+
+class LoggedBody:
+    """
+    The response body passed to the logger as an argument. It is
+    formatted only when a handler renders the record, and bodies longer
+    than the limit are truncated instead of being pretty-printed.
+    """
+
+    __slots__ = ("response", "limit")
+
+    def __init__(self, response: GreenAPIResponse, limit: Optional[int]):
+        self.response = response
+        self.limit = limit
+
+    def __str__(self) -> str:
+        response = self.response
+        size = len(response.content)
+
+        if self.limit is not None and size > self.limit:
+            data = response.content[:self.limit].decode("UTF-8", errors="ignore")
+
+            return f"{data}... ({size - self.limit} more bytes)"
+
+        try:
+            if response.code == 200:
+                data = response.data
+            else:
+                data = loads(response.content)
+
+            return json.dumps(data, ensure_ascii=False, indent=4)
+        except ValueError:
+            data = response.text
+
+            if not data and response.code == 401:
+                data = "Unauthorized"
+
+            return data
 
 
 class AsyncGreenAPI(AsyncGreenApi):
@@ -1,3 +1,25 @@
 from .API import AsyncGreenAPI
+from .breaker import CircuitBreaker
+from .cache import MemoryCache, SQLiteCache
+from .dispatcher import Dispatcher
+from .history import HistorySync
+from .outbox import Outbox
+from .pool import InstancePool
+from .retry import RetryPolicy
+from .sync import SyncGreenAPI, SyncGreenApi
+from .uploads import UploadCache
 
-__all__ = ['AsyncGreenAPI']
+__all__ = [
+    'AsyncGreenAPI',
+    'CircuitBreaker',
+    'Dispatcher',
+    'HistorySync',
+    'InstancePool',
+    'MemoryCache',
+    'Outbox',
+    'RetryPolicy',
+    'SQLiteCache',
+    'SyncGreenAPI',
+    'SyncGreenApi',
+    'UploadCache'
+]
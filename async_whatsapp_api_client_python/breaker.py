@@ -0,0 +1,164 @@
+import time
+from contextvars import ContextVar
+from typing import (
+    Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+)
+
+if TYPE_CHECKING:
+    from .API import AsyncGreenApi
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class StateChange(NamedTuple):
+    id_instance: str
+    method: str
+    previous: str
+    state: str
+
+
+class Circuit:
+    __slots__ = ("state", "failures", "changed_at", "trial")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.changed_at = 0.0
+        self.trial = False
+
+
+class CircuitBreaker:
+    """
+    The circuit breaker keyed by the instance ID and the API method.
+
+    A circuit opens after `failure_threshold` failed requests in a row
+    and the requests of the method fail fast without being sent. Once
+    `recovery_timeout` has passed the circuit is half-open: the state of
+    the instance is checked with getStateInstance and, if the instance
+    is authorized, one request is let through as a trial. The circuit
+    closes if the trial succeeds and opens again otherwise.
+
+    One breaker can be shared by the clients of an InstancePool. State
+    changes are passed to the callables of `hooks`, so traffic can be
+    moved to healthy instances.
+    """
+
+    def __init__(
+            self,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30.0,
+            status_codes: Iterable[int] = (401, 403, 500, 502, 503, 504)
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.status_codes = frozenset(status_codes)
+        self.hooks: List[Callable[[StateChange], Any]] = []
+
+        self._circuits: Dict[Tuple[str, str], Circuit] = {}
+
+    def state(self, id_instance: str, method: str) -> str:
+        circuit = self._circuits.get((str(id_instance), method))
+
+        return circuit.state if circuit is not None else CLOSED
+
+    def open_methods(self, id_instance: str) -> List[str]:
+        """Returns the methods of the instance that are not closed."""
+
+        id_instance = str(id_instance)
+
+        return [
+            method for (instance, method), circuit in self._circuits.items()
+            if instance == id_instance and circuit.state != CLOSED
+        ]
+
+    def failed(self, status_code: Optional[int], error: Optional[Exception]) -> bool:
+        return error is not None or status_code in self.status_codes
+
+    async def allow(self, api: "AsyncGreenApi", method: str) -> bool:
+        if _probing.get():
+            return True
+
+        circuit = self._circuits.get((api.id_instance, method))
+        if circuit is None or circuit.state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        if now - circuit.changed_at < self.recovery_timeout:
+            if circuit.state == OPEN or circuit.trial:
+                return False
+        if circuit.state == OPEN:
+            self.__change(api.id_instance, method, circuit, HALF_OPEN)
+
+        # A trial that has not finished in time, e.g. a cancelled one,
+        # is taken over by this request.
+        circuit.trial = True
+        circuit.changed_at = now
+
+        if method == "getStateInstance" or await self.__probe(api):
+            return True
+
+        self.__change(api.id_instance, method, circuit, OPEN)
+
+        return False
+
+    def record(
+            self,
+            id_instance: str,
+            method: str,
+            status_code: Optional[int],
+            error: Optional[Exception]
+    ) -> None:
+        if _probing.get():
+            return None
+
+        key = (id_instance, method)
+        circuit = self._circuits.get(key)
+
+        if not self.failed(status_code, error):
+            if circuit is not None:
+                del self._circuits[key]
+                if circuit.state != CLOSED:
+                    self.__change(id_instance, method, circuit, CLOSED)
+
+            return None
+
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit()
+        circuit.failures += 1
+
+        if circuit.state == HALF_OPEN or (
+                circuit.state == CLOSED
+                and circuit.failures >= self.failure_threshold
+        ):
+            self.__change(id_instance, method, circuit, OPEN)
+
+    async def __probe(self, api: "AsyncGreenApi") -> bool:
+        token = _probing.set(True)
+        try:
+            response = await api.account.get_state_instance()
+        except Exception:
+            return False
+        finally:
+            _probing.reset(token)
+
+        if response.code != 200:
+            return False
+
+        return (response.data or {}).get("stateInstance") == "authorized"
+
+    def __change(
+            self, id_instance: str, method: str, circuit: Circuit, state: str
+    ) -> None:
+        previous = circuit.state
+
+        circuit.state = state
+        circuit.changed_at = time.monotonic()
+        circuit.trial = False
+
+        for hook in self.hooks:
+            hook(StateChange(id_instance, method, previous, state))
+
+
+_probing: ContextVar[bool] = ContextVar("probing", default=False)
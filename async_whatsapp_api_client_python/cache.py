@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, Union
+
+from .sqlite import Database
+
+
+class CacheBackend:
+    """
+    The interface of cache backends. Values must be JSON serializable
+    for backends that persist them.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """The in-memory cache that evicts the least recently used entries."""
+
+    def __init__(self, max_size: Optional[int] = 10000):
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    The cache stored in an SQLite file, which can be shared by several
+    processes. Queries run in a worker thread.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], table: str = "cache"):
+        self.path = path
+        self.table = table
+
+        self._database = Database(path)
+        self._database.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    def close(self) -> None:
+        self._database.close()
+
+    def _get(self, key: str) -> Optional[Any]:
+        row = self._database.fetchone(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+        )
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self._delete(key)
+            return None
+
+        return json.loads(value)
+
+    def _set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        self._database.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at)"
+            " VALUES (?, ?, ?)",
+            (key, json.dumps(value), expires_at)
+        )
+
+    def _delete(self, key: str) -> None:
+        self._database.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
@@ -0,0 +1,127 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Set,
+    Tuple,
+    TypeVar,
+    Union
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE: Any = object()
+
+
+class SingleFlight(Generic[R]):
+    """
+    Runs one call at a time per key, concurrent calls with the same key
+    share its result or error. The call is not cancelled with one of its
+    callers.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    async def run(self, key: Hashable, function: Callable[[], Awaitable[R]]) -> R:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.create_task(function())
+            task.add_done_callback(lambda _: self.__done(key, task))
+
+        return await asyncio.shield(task)
+
+    def current(self, key: Hashable) -> bool:
+        """Returns whether the calling task is the call of the key."""
+
+        return self._tasks.get(key) is asyncio.current_task()
+
+    def forget(self, key: Hashable) -> None:
+        """The next call with the key is run again, the running one is not shared."""
+
+        self._tasks.pop(key, None)
+
+    def __done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        if not task.cancelled():
+            # Errors are raised to the callers, retrieving the error here
+            # keeps it from being logged when they were all cancelled.
+            task.exception()
+
+
+async def imap_unordered(
+        function: Callable[[T], Awaitable[R]],
+        items: Union[Iterable[T], AsyncIterable[T]],
+        concurrency: int
+) -> AsyncIterator[Tuple[T, R]]:
+    """
+    Runs the function for the items concurrently and yields pairs of
+    the item and its result as they complete. A slot is freed only when
+    its result is consumed, so at most `concurrency` items are in flight
+    or waiting to be consumed however long the input is. An exception
+    of the function is raised by the iterator and cancels the rest.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    tasks: Set[asyncio.Task] = set()
+
+    async def run(item: T) -> None:
+        try:
+            result = await function(item)
+        except Exception as error:
+            await results.put(error)
+        else:
+            await results.put((item, result))
+
+    def schedule(item: T) -> None:
+        task = asyncio.create_task(run(item))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def produce() -> None:
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await semaphore.acquire()
+                    schedule(item)
+            else:
+                for item in items:
+                    await semaphore.acquire()
+                    schedule(item)
+
+            await asyncio.gather(*list(tasks))
+        except Exception as error:
+            await results.put(error)
+        await results.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            result = await results.get()
+            if result is _DONE:
+                break
+            if isinstance(result, Exception):
+                raise result
+
+            semaphore.release()
+            yield result
+    finally:
+        pending = list(tasks)
+        for task in pending:
+            task.cancel()
+        producer.cancel()
+        await asyncio.gather(producer, *pending, return_exceptions=True)
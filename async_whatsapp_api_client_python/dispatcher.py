@@ -0,0 +1,104 @@
+import inspect
+from typing import (
+    Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+)
+
+Handler = Callable[[dict], Any]
+Key = Tuple[Optional[str], Optional[str], Optional[str]]
+Shape = Tuple[bool, bool, bool]
+
+
+class Route(NamedTuple):
+    order: int
+    handler: Handler
+    predicate: Optional[Callable[[dict], bool]]
+
+
+class Dispatcher:
+    """
+    The router of notifications. Handlers are registered by the webhook
+    type, the message type, the chat ID and a predicate, any of which may
+    be omitted. A notification is handled by the first registered handler
+    that matches it, or by the fallback handler.
+
+    Routes are indexed by the registered criteria, so a notification is
+    resolved with a few dictionary lookups. A dispatcher is passed as the
+    notification handler itself:
+
+        await api.webhooks.start_receiving_notifications(dispatcher)
+    """
+
+    def __init__(self, fallback: Optional[Handler] = None):
+        self.fallback = fallback
+
+        self._routes: Dict[Key, List[Route]] = {}
+        self._count = 0
+        self._shapes: FrozenSet[Shape] = frozenset()
+
+    def add(
+            self,
+            handler: Handler,
+            type_webhook: Optional[str] = None,
+            type_message: Optional[str] = None,
+            chat_id: Optional[str] = None,
+            predicate: Optional[Callable[[dict], bool]] = None
+    ) -> Handler:
+        key = (type_webhook, type_message, chat_id)
+
+        self._routes.setdefault(key, []).append(
+            Route(self._count, handler, predicate)
+        )
+        self._count += 1
+        self._shapes = self._shapes | {
+            (type_webhook is not None, type_message is not None, chat_id is not None)
+        }
+
+        return handler
+
+    def on(
+            self,
+            type_webhook: Optional[str] = None,
+            type_message: Optional[str] = None,
+            chat_id: Optional[str] = None,
+            predicate: Optional[Callable[[dict], bool]] = None
+    ) -> Callable[[Handler], Handler]:
+        """The decorator form of add."""
+
+        def decorator(handler: Handler) -> Handler:
+            return self.add(
+                handler, type_webhook, type_message, chat_id, predicate
+            )
+
+        return decorator
+
+    def resolve(self, body: dict) -> Optional[Handler]:
+        type_webhook = body.get("typeWebhook")
+        type_message = (body.get("messageData") or {}).get("typeMessage")
+        chat_id = (body.get("senderData") or {}).get("chatId") or body.get("chatId")
+
+        values = (type_webhook, type_message, chat_id)
+
+        candidates: List[Route] = []
+        for shape in self._shapes:
+            key = tuple(
+                value if used else None for value, used in zip(values, shape)
+            )
+            routes = self._routes.get(key)
+            if routes:
+                candidates.extend(routes)
+
+        if len(self._shapes) > 1:
+            candidates.sort()
+
+        for route in candidates:
+            if route.predicate is None or route.predicate(body):
+                return route.handler
+
+        return self.fallback
+
+    async def __call__(self, type_webhook: str, body: dict) -> None:
+        handler = self.resolve(body)
+        if handler is not None:
+            result = handler(body)
+            if inspect.isawaitable(result):
+                await result
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import os
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Union
+)
+
+from .concurrency import imap_unordered
+from .ratelimit import TokenBucket
+from .sqlite import Database
+
+if TYPE_CHECKING:
+    from .API import AsyncGreenApi
+
+
+class HistorySync:
+    """
+    The local copy of the chat history stored in an SQLite file.
+
+    A sync of a chat fetches only the messages newer than the latest
+    stored one, the watermark of the chat. As getChatHistory returns the
+    last messages of a chat, the number of requested messages is doubled
+    until the watermark is reached or the chat has no more messages. The
+    first sync of a chat fetches up to max_count messages. Messages are
+    stored once by their idMessage.
+    """
+
+    def __init__(
+            self,
+            api: "AsyncGreenApi",
+            path: Union[str, os.PathLike],
+            count: int = 100,
+            max_count: int = 10000
+    ):
+        self.api = api
+        self.path = path
+        self.count = count
+        self.max_count = max_count
+
+        self._database = Database(path)
+        self._database.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "chat_id TEXT NOT NULL,"
+            " id_message TEXT NOT NULL,"
+            " timestamp INTEGER NOT NULL,"
+            " type TEXT,"
+            " message TEXT NOT NULL,"
+            " PRIMARY KEY (chat_id, id_message)) WITHOUT ROWID"
+        )
+        self._database.execute(
+            "CREATE INDEX IF NOT EXISTS messages_timestamp"
+            " ON messages (chat_id, timestamp)"
+        )
+        self._database.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "chat_id TEXT PRIMARY KEY, timestamp INTEGER NOT NULL)"
+        )
+
+    def sync(
+            self,
+            chat_ids: Union[Iterable[str], AsyncIterable[str]],
+            concurrency: int = 4,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Optional[int]]]:
+        """
+        Syncs the chats concurrently and yields pairs of the chat ID and
+        the number of new messages as they complete, None if the history
+        was not received. The rate limits requests per second as in
+        Sending.send_many.
+        """
+
+        limiter = TokenBucket(rate, burst) if rate else None
+
+        return imap_unordered(
+            lambda chat_id: self.sync_chat(chat_id, limiter), chat_ids, concurrency
+        )
+
+    async def sync_chat(
+            self, chat_id: str, limiter: Optional[TokenBucket] = None
+    ) -> Optional[int]:
+        """
+        Syncs the chat and returns the number of new messages, None if
+        the history was not received.
+        """
+
+        watermark = await self.watermark(chat_id)
+
+        count = self.count
+        while True:
+            if limiter is not None:
+                await limiter.acquire()
+
+            response = await self.api.journals.get_chat_history(chat_id, count)
+            if limiter is not None:
+                limiter.update(response.code)
+            if response.code != 200:
+                return None
+
+            messages = response.data or []
+            if (
+                    len(messages) < count
+                    or count >= self.max_count
+                    or (watermark is not None and min(
+                        message["timestamp"] for message in messages
+                    ) <= watermark)
+            ):
+                break
+
+            count = min(count * 2, self.max_count)
+
+        return await self.__store(chat_id, messages)
+
+    async def sync_recent(self, minutes: Optional[int] = None) -> int:
+        """
+        Stores the last incoming and outgoing messages of all chats and
+        returns the number of new messages. Watermarks are not moved, as
+        older messages of the chats may still be missing. Messages that
+        were not received are skipped.
+        """
+
+        stored = 0
+        for request in (
+                self.api.journals.last_incoming_messages,
+                self.api.journals.last_outgoing_messages
+        ):
+            response = await request(minutes)
+            if response.code != 200:
+                continue
+
+            stored += await asyncio.to_thread(self._insert, response.data or [])
+
+        return stored
+
+    async def messages(
+            self,
+            chat_id: str,
+            since: Optional[int] = None,
+            limit: Optional[int] = None
+    ) -> List[dict]:
+        """Returns the stored messages of the chat from the oldest one."""
+
+        rows = await asyncio.to_thread(
+            self._database.fetchall,
+            "SELECT message FROM messages WHERE chat_id = ? AND timestamp >= ?"
+            " ORDER BY timestamp, id_message LIMIT ?",
+            (chat_id, since or 0, -1 if limit is None else limit)
+        )
+
+        return [json.loads(message) for message, in rows]
+
+    async def watermark(self, chat_id: str) -> Optional[int]:
+        row = await asyncio.to_thread(
+            self._database.fetchone,
+            "SELECT timestamp FROM watermarks WHERE chat_id = ?",
+            (chat_id,)
+        )
+
+        return row[0] if row is not None else None
+
+    def close(self) -> None:
+        self._database.close()
+
+    async def __aenter__(self) -> "HistorySync":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __store(self, chat_id: str, messages: List[dict]) -> int:
+        for message in messages:
+            message.setdefault("chatId", chat_id)
+
+        return await asyncio.to_thread(self._insert, messages, chat_id)
+
+    def _insert(self, messages: List[dict], chat_id: Optional[str] = None) -> int:
+        rows = [
+            (
+                message["chatId"],
+                message["idMessage"],
+                message["timestamp"],
+                message.get("type"),
+                json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+            )
+            for message in messages
+        ]
+
+        with self._database.transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO messages"
+                " (chat_id, id_message, timestamp, type, message)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            stored = connection.total_changes - before
+
+            if chat_id is not None and rows:
+                connection.execute(
+                    "INSERT INTO watermarks (chat_id, timestamp) VALUES (?, ?)"
+                    " ON CONFLICT (chat_id) DO UPDATE"
+                    " SET timestamp = MAX(timestamp, excluded.timestamp)",
+                    (chat_id, max(row[2] for row in rows))
+                )
+
+        return stored
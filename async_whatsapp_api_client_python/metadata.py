@@ -0,0 +1,167 @@
+from typing import Awaitable, Callable, Optional, TYPE_CHECKING
+
+from .cache import CacheBackend, MemoryCache
+from .concurrency import SingleFlight
+from .response import Response
+
+if TYPE_CHECKING:
+    from .API import AsyncGreenApi
+
+# Types of messages with content, other messages of group chats are
+# notifications of changes of the group, e.g. of its participants.
+CONTENT_MESSAGES = frozenset({
+    "textMessage",
+    "extendedTextMessage",
+    "quotedMessage",
+    "imageMessage",
+    "videoMessage",
+    "documentMessage",
+    "audioMessage",
+    "stickerMessage",
+    "locationMessage",
+    "contactMessage",
+    "contactsArrayMessage",
+    "reactionMessage",
+    "pollMessage",
+    "pollUpdateMessage",
+    "buttonsResponseMessage",
+    "listResponseMessage",
+    "templateButtonsReplyMessage",
+    "editedMessage",
+    "deletedMessage"
+})
+
+
+class MetadataCache:
+    """
+    The cache of contacts, contact information, avatars and group data
+    of an instance. Entries are kept in the backend for the TTL, the
+    default backend evicts the least recently used ones. Concurrent
+    misses of the same entry share one request, failed responses are
+    not cached.
+
+    Entries are invalidated by the changes made by the client, e.g.
+    adding a group participant, and by notifications: notifications of
+    group chats without content, and messages of senders whose name
+    differs from the cached contact information.
+    """
+
+    def __init__(
+            self,
+            api: "AsyncGreenApi",
+            backend: Optional[CacheBackend] = None,
+            ttl: Optional[float] = 60 * 60,
+            avatar_ttl: Optional[float] = 24 * 60 * 60
+    ):
+        self.api = api
+        self.backend = backend or MemoryCache()
+        self.ttl = ttl
+        self.avatar_ttl = avatar_ttl
+
+        self._in_flight: SingleFlight[Response] = SingleFlight()
+
+    async def get_contacts(self) -> Response:
+        return await self.__get(
+            "getContacts", "", self.api.service_methods.get_contacts, self.ttl
+        )
+
+    async def get_contact_info(self, chat_id: str) -> Response:
+        return await self.__get(
+            "getContactInfo",
+            chat_id,
+            lambda: self.api.service_methods.get_contact_info(chat_id),
+            self.ttl
+        )
+
+    async def get_avatar(self, chat_id: str) -> Response:
+        return await self.__get(
+            "getAvatar",
+            chat_id,
+            lambda: self.api.service_methods.get_avatar(chat_id),
+            self.avatar_ttl
+        )
+
+    async def get_group_data(self, group_id: str) -> Response:
+        return await self.__get(
+            "getGroupData",
+            group_id,
+            lambda: self.api.groups.get_group_data(group_id),
+            self.ttl
+        )
+
+    async def invalidate_contact(self, chat_id: str) -> None:
+        await self.__delete("getContactInfo", chat_id)
+        await self.__delete("getAvatar", chat_id)
+        await self.__delete("getContacts", "")
+
+    async def invalidate_group(self, group_id: str) -> None:
+        await self.__delete("getGroupData", group_id)
+        await self.__delete("getAvatar", group_id)
+
+    async def handle_notification(self, type_webhook: str, body: dict) -> None:
+        """Invalidates the entries changed according to the notification."""
+
+        sender_data = body.get("senderData")
+        if not sender_data:
+            return None
+
+        chat_id = sender_data.get("chatId", "")
+        type_message = (body.get("messageData") or {}).get("typeMessage")
+
+        if chat_id.endswith("@g.us"):
+            if type_message is not None and type_message not in CONTENT_MESSAGES:
+                await self.invalidate_group(chat_id)
+            return None
+
+        sender_name = sender_data.get("senderName")
+        if type_webhook != "incomingMessageReceived" or not sender_name:
+            return None
+
+        info = await self.backend.get(self.__key("getContactInfo", chat_id))
+        if info is None:
+            return None
+
+        data = Response(200, info).data
+        name = data.get("name") if isinstance(data, dict) else None
+        if name and name != sender_name:
+            await self.invalidate_contact(chat_id)
+
+    async def __get(
+            self,
+            method: str,
+            argument: str,
+            request: Callable[[], Awaitable[Response]],
+            ttl: Optional[float]
+    ) -> Response:
+        key = self.__key(method, argument)
+
+        content = await self.backend.get(key)
+        if content is not None:
+            return Response(200, content)
+
+        return await self._in_flight.run(
+            key, lambda: self.__fetch(key, request, ttl)
+        )
+
+    async def __fetch(
+            self,
+            key: str,
+            request: Callable[[], Awaitable[Response]],
+            ttl: Optional[float]
+    ) -> Response:
+        response = await request()
+
+        # The entry is not stored if it was invalidated meanwhile.
+        if response.code == 200 and self._in_flight.current(key):
+            await self.backend.set(key, response.text, ttl)
+
+        return response
+
+    async def __delete(self, method: str, argument: str) -> None:
+        key = self.__key(method, argument)
+
+        self._in_flight.forget(key)
+        await self.backend.delete(key)
+
+    def __key(self, method: str, argument: str) -> str:
+        return f"metadata:{self.api.id_instance}:{method}:{argument}"
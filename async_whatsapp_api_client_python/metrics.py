@@ -0,0 +1,263 @@
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from httpx import Response
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics(NamedTuple):
+    id_instance: str
+    method: Optional[str]
+    status_code: Optional[int]
+    error: Optional[BaseException]
+    attempts: int
+    elapsed: float
+    pool_wait: Optional[float]
+    bytes_sent: int
+    bytes_received: int
+
+
+class Instrument:
+    """
+    The interface of request instruments. `started` is called before
+    a request is sent and `finished` after its last attempt, including
+    requests that failed or were cancelled. Clients without instruments
+    do not measure anything.
+    """
+
+    def started(self, id_instance: str, method: Optional[str]) -> None:
+        pass
+
+    def finished(self, metrics: RequestMetrics) -> None:
+        pass
+
+
+class RequestUsage:
+    """
+    Accumulates the measurements of the attempts of a request. The time
+    spent waiting for a connection of the pool is measured until the
+    first event of the trace extension of httpx, which is emitted once
+    the request has a connection.
+    """
+
+    __slots__ = (
+        "extensions", "started", "attempts", "status_code", "error",
+        "pool_wait", "bytes_sent", "bytes_received", "_attempt_started"
+    )
+
+    def __init__(self):
+        self.extensions = {"trace": self.trace}
+        self.started = time.perf_counter()
+        self.attempts = 0
+        self.status_code: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.pool_wait: Optional[float] = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+        self._attempt_started: Optional[float] = None
+
+    def begin(self) -> None:
+        self.attempts += 1
+        self._attempt_started = time.perf_counter()
+
+    async def trace(self, event: str, info: Dict[str, Any]) -> None:
+        if self._attempt_started is not None:
+            self.pool_wait = (
+                (self.pool_wait or 0.0)
+                + time.perf_counter() - self._attempt_started
+            )
+            self._attempt_started = None
+
+    def add(self, response: Optional[Response], error: Optional[BaseException]) -> None:
+        self._attempt_started = None
+        self.error = error
+
+        if response is not None:
+            self.status_code = response.status_code
+            self.bytes_sent += int(response.request.headers.get("Content-Length", 0))
+            self.bytes_received += len(response.content)
+        else:
+            self.status_code = None
+
+    def metrics(self, id_instance: str, method: Optional[str]) -> RequestMetrics:
+        return RequestMetrics(
+            id_instance,
+            method,
+            self.status_code,
+            self.error,
+            self.attempts,
+            time.perf_counter() - self.started,
+            self.pool_wait,
+            self.bytes_sent,
+            self.bytes_received
+        )
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class PrometheusMetrics(Instrument):
+    """
+    Collects request metrics by API method and renders them in the
+    Prometheus text format:
+
+        greenapi_requests_total{method, status}
+        greenapi_requests_in_flight{method}
+        greenapi_request_duration_seconds{method}
+        greenapi_pool_wait_seconds{method}
+        greenapi_retries_total{method}
+        greenapi_sent_bytes_total{method}
+        greenapi_received_bytes_total{method}
+
+    The status of requests that failed without a response is "error".
+    """
+
+    def __init__(
+            self,
+            prefix: str = "greenapi",
+            buckets: Sequence[float] = DURATION_BUCKETS
+    ):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+
+        self.requests: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.durations: Dict[str, Histogram] = {}
+        self.pool_waits: Dict[str, Histogram] = {}
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.sent: Dict[str, int] = defaultdict(int)
+        self.received: Dict[str, int] = defaultdict(int)
+
+    def started(self, id_instance: str, method: Optional[str]) -> None:
+        self.in_flight[method or "unknown"] += 1
+
+    def finished(self, metrics: RequestMetrics) -> None:
+        method = metrics.method or "unknown"
+        status = str(metrics.status_code) if metrics.status_code is not None else "error"
+
+        self.in_flight[method] -= 1
+        self.requests[(method, status)] += 1
+        self.__histogram(self.durations, method).observe(metrics.elapsed)
+        if metrics.pool_wait is not None:
+            self.__histogram(self.pool_waits, method).observe(metrics.pool_wait)
+        if metrics.attempts > 1:
+            self.retries[method] += metrics.attempts - 1
+        self.sent[method] += metrics.bytes_sent
+        self.received[method] += metrics.bytes_received
+
+    def render(self) -> str:
+        prefix = self.prefix
+        lines: List[str] = []
+
+        lines += self.__header(f"{prefix}_requests_total", "counter", "Requests by API method and status.")
+        for (method, status), value in sorted(self.requests.items()):
+            lines.append(f'{prefix}_requests_total{{method="{method}",status="{status}"}} {value}')
+
+        lines += self.__header(f"{prefix}_requests_in_flight", "gauge", "Requests in flight by API method.")
+        for method, value in sorted(self.in_flight.items()):
+            lines.append(f'{prefix}_requests_in_flight{{method="{method}"}} {value}')
+
+        for name, histograms, description in (
+                (f"{prefix}_request_duration_seconds", self.durations, "Request duration including retries."),
+                (f"{prefix}_pool_wait_seconds", self.pool_waits, "Time spent waiting for a pooled connection.")
+        ):
+            lines += self.__header(name, "histogram", description)
+            for method, histogram in sorted(histograms.items()):
+                lines += self.__render_histogram(name, method, histogram)
+
+        for name, values, description in (
+                (f"{prefix}_retries_total", self.retries, "Retried attempts by API method."),
+                (f"{prefix}_sent_bytes_total", self.sent, "Request body bytes by API method."),
+                (f"{prefix}_received_bytes_total", self.received, "Response body bytes by API method.")
+        ):
+            lines += self.__header(name, "counter", description)
+            for method, value in sorted(values.items()):
+                lines.append(f'{name}{{method="{method}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def __histogram(self, histograms: Dict[str, Histogram], method: str) -> Histogram:
+        histogram = histograms.get(method)
+        if histogram is None:
+            histogram = histograms[method] = Histogram(self.buckets)
+
+        return histogram
+
+    @staticmethod
+    def __header(name: str, kind: str, description: str) -> List[str]:
+        return [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+
+    @staticmethod
+    def __render_histogram(name: str, method: str, histogram: Histogram) -> List[str]:
+        lines = []
+
+        total = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            total += count
+            lines.append(f'{name}_bucket{{method="{method}",le="{bound}"}} {total}')
+        lines.append(f'{name}_bucket{{method="{method}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{method="{method}"}} {histogram.sum}')
+        lines.append(f'{name}_count{{method="{method}"}} {histogram.count}')
+
+        return lines
+
+
+class OpenTelemetrySpans(Instrument):
+    """
+    Records a client span for every request with the OpenTelemetry API,
+    which must be installed. The span is created when the request has
+    finished with its measured start time.
+    """
+
+    def __init__(self, tracer: Any = None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("async_whatsapp_api_client_python")
+
+    def finished(self, metrics: RequestMetrics) -> None:
+        trace = self._trace
+
+        end_time = time.time_ns()
+        attributes = {
+            "greenapi.method": metrics.method or "unknown",
+            "greenapi.id_instance": metrics.id_instance,
+            "greenapi.attempts": metrics.attempts,
+            "greenapi.sent_bytes": metrics.bytes_sent,
+            "greenapi.received_bytes": metrics.bytes_received
+        }
+        if metrics.status_code is not None:
+            attributes["http.response.status_code"] = metrics.status_code
+        if metrics.pool_wait is not None:
+            attributes["greenapi.pool_wait"] = metrics.pool_wait
+
+        span = self.tracer.start_span(
+            f"GreenAPI {metrics.method or 'request'}",
+            kind=trace.SpanKind.CLIENT,
+            attributes=attributes,
+            start_time=end_time - int(metrics.elapsed * 1e9)
+        )
+        if metrics.error is not None:
+            span.record_exception(metrics.error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(metrics.error)))
+        elif metrics.status_code != 200:
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end(end_time=end_time)
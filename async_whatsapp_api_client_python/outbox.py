@@ -0,0 +1,345 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Union
+)
+
+from .concurrency import imap_unordered
+from .ratelimit import TokenBucket
+from .response import Response
+from .sqlite import Database
+
+if TYPE_CHECKING:
+    from .API import AsyncGreenApi
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+class OutboxMessage(NamedTuple):
+    id: int
+    message: dict
+    status: str
+    attempts: int
+    id_message: Optional[str]
+    error: Optional[str]
+
+
+class Outbox:
+    """
+    The durable queue of outgoing messages stored in an SQLite file.
+
+    A message is a dictionary of arguments of a sending method, as in
+    Sending.send_many, and it is stored once put returns. Messages are
+    sent by a pool of workers and the idMessage of a sent message is
+    recorded. Writes made at the same time, puts as well as results,
+    are committed together in one transaction, so an fsync is shared by
+    many messages.
+
+    Messages that were not recorded as sent are sent again after a
+    restart, so a message sent right before a crash may be sent twice.
+    Failed messages are retried up to max_attempts times.
+    """
+
+    def __init__(
+            self,
+            api: "AsyncGreenApi",
+            path: Union[str, os.PathLike],
+            table: str = "outbox",
+            max_attempts: int = 5,
+            retry_delay: float = 1.0,
+            batch_size: int = 500,
+            synchronous: str = "FULL"
+    ):
+        self.api = api
+        self.path = path
+        self.table = table
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.batch_size = batch_size
+
+        self._database = Database(path, synchronous)
+        self._database.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " message TEXT NOT NULL,"
+            f" status TEXT NOT NULL DEFAULT '{PENDING}',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " id_message TEXT,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL)"
+        )
+        self._database.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_status ON {table} (status, id)"
+        )
+
+        self._writes: List[Tuple[str, tuple, Optional[asyncio.Future]]] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._added: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def put(self, message: dict) -> int:
+        """Stores the message and returns its ID in the outbox."""
+
+        return (await self.put_many([message]))[0]
+
+    async def put_many(self, messages: Iterable[dict]) -> List[int]:
+        now = time.time()
+
+        futures = [
+            self.__write(
+                f"INSERT INTO {self.table} (message, created_at) VALUES (?, ?)",
+                (json.dumps(message), now),
+                wait=True
+            )
+            for message in messages
+        ]
+        ids = list(await asyncio.gather(*futures))
+
+        if self._added is not None:
+            self._added.set()
+
+        return ids
+
+    async def get(self, id: int) -> Optional[OutboxMessage]:
+        row = await asyncio.to_thread(
+            self._database.fetchone,
+            f"SELECT id, message, status, attempts, id_message, error"
+            f" FROM {self.table} WHERE id = ?",
+            (id,)
+        )
+        if row is None:
+            return None
+
+        return OutboxMessage(row[0], json.loads(row[1]), *row[2:])
+
+    async def counts(self) -> Dict[str, int]:
+        """Returns the number of messages by status."""
+
+        rows = await asyncio.to_thread(
+            self._database.fetchall,
+            f"SELECT status, COUNT(*) FROM {self.table} GROUP BY status",
+            ()
+        )
+
+        return {PENDING: 0, SENT: 0, FAILED: 0, **dict(rows)}
+
+    async def drain(
+            self,
+            concurrency: int = 10,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None
+    ) -> int:
+        """
+        Sends pending messages until there are none left, including the
+        messages put while draining, and returns the number of sent
+        messages. Failed messages are retried after retry_delay.
+        """
+
+        limiter = TokenBucket(rate, burst) if rate else None
+
+        sent = 0
+        while True:
+            processed, failed = 0, 0
+            async for _, response in imap_unordered(
+                    lambda row: self.__send(row, limiter),
+                    self.__pending(),
+                    concurrency
+            ):
+                processed += 1
+                if response.code == 200:
+                    sent += 1
+                else:
+                    failed += 1
+            await self.flush()
+
+            if not failed:
+                if not processed:
+                    return sent
+            else:
+                await asyncio.sleep(self.retry_delay)
+
+    def start(
+            self,
+            concurrency: int = 10,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None
+    ) -> None:
+        """Starts draining the outbox in the background whenever messages are put."""
+
+        self._added = asyncio.Event()
+        self._task = asyncio.create_task(self.__run(concurrency, rate, burst))
+
+    async def stop(self) -> None:
+        """Stops draining and commits the results of sent messages."""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._added = None
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Waits until all writes are committed."""
+
+        while self._writer is not None:
+            await asyncio.shield(self._writer)
+
+    async def close(self) -> None:
+        await self.stop()
+
+        self._database.close()
+
+    async def __aenter__(self) -> "Outbox":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def __run(
+            self, concurrency: int, rate: Optional[float], burst: Optional[int]
+    ) -> None:
+        while True:
+            self._added.clear()
+            try:
+                await self.drain(concurrency, rate, burst)
+            except Exception:
+                self.api.logger.exception("Outbox draining was failed with error.")
+
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            await self._added.wait()
+
+    async def __pending(self) -> AsyncIterator[Tuple[int, str]]:
+        last_id = 0
+        while True:
+            rows = await asyncio.to_thread(
+                self._database.fetchall,
+                f"SELECT id, message FROM {self.table}"
+                f" WHERE status = '{PENDING}' AND id > ? ORDER BY id LIMIT ?",
+                (last_id, self.batch_size)
+            )
+            if not rows:
+                return
+
+            for row in rows:
+                yield row
+            last_id = rows[-1][0]
+
+    async def __send(
+            self, row: Tuple[int, str], limiter: Optional[TokenBucket]
+    ) -> Response:
+        row_id, message = row
+
+        try:
+            arguments = json.loads(message)
+            method = self.__method(arguments.pop("method", "send_message"))
+        except Exception as error:
+            # The message cannot be sent, it is not retried.
+            self.__write(
+                f"UPDATE {self.table} SET status = '{FAILED}', attempts = attempts + 1,"
+                " error = ?, updated_at = ? WHERE id = ?",
+                (str(error), time.time(), row_id)
+            )
+
+            return Response(None, str(error))
+
+        if limiter is not None:
+            await limiter.acquire()
+
+        try:
+            response = await method(**arguments)
+        except Exception as error:
+            response = Response(None, str(error))
+
+        if limiter is not None:
+            limiter.update(response.code)
+
+        if response.code == 200:
+            self.__write(
+                f"UPDATE {self.table} SET status = '{SENT}', id_message = ?,"
+                " attempts = attempts + 1, error = NULL, updated_at = ? WHERE id = ?",
+                ((response.data or {}).get("idMessage"), time.time(), row_id)
+            )
+        else:
+            self.__write(
+                f"UPDATE {self.table} SET attempts = attempts + 1, error = ?,"
+                f" status = CASE WHEN attempts + 1 >= ? THEN '{FAILED}'"
+                f" ELSE '{PENDING}' END, updated_at = ? WHERE id = ?",
+                (response.text, self.max_attempts, time.time(), row_id)
+            )
+
+        return response
+
+    def __method(self, name: Any) -> Callable[..., Awaitable[Response]]:
+        method = None
+        if isinstance(name, str) and not name.startswith("_"):
+            method = getattr(self.api.sending, name, None)
+
+        if not callable(method):
+            raise ValueError(f"Unknown sending method: {name}.")
+
+        return method
+
+    def __write(
+            self, sql: str, parameters: tuple, wait: bool = False
+    ) -> Optional[asyncio.Future]:
+        future = asyncio.get_running_loop().create_future() if wait else None
+
+        self._writes.append((sql, parameters, future))
+        if self._writer is None:
+            self._writer = asyncio.create_task(self.__commit())
+
+        return future
+
+    async def __commit(self) -> None:
+        # Writes queued while a transaction is committed are committed
+        # together by the next one.
+        try:
+            while self._writes:
+                writes, self._writes = self._writes, []
+
+                try:
+                    ids = await asyncio.to_thread(
+                        self._execute, [(sql, parameters) for sql, parameters, _ in writes]
+                    )
+                except Exception as error:
+                    self.api.logger.log(
+                        logging.ERROR, "Outbox writes were failed with error: %s.", error
+                    )
+                    for _, _, future in writes:
+                        if future is not None and not future.done():
+                            future.set_exception(error)
+                    continue
+
+                for (_, _, future), row_id in zip(writes, ids):
+                    if future is not None and not future.done():
+                        future.set_result(row_id)
+        finally:
+            self._writer = None
+
+    def _execute(self, writes: List[Tuple[str, tuple]]) -> List[int]:
+        with self._database.transaction() as connection:
+            return [
+                connection.execute(sql, parameters).lastrowid
+                for sql, parameters in writes
+            ]
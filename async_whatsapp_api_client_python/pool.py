@@ -0,0 +1,115 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from httpx import AsyncClient
+
+from .API import AsyncGreenApi, create_session
+from .breaker import CircuitBreaker
+from .metrics import Instrument
+from .retry import RetryPolicy
+from .uploads import UploadCache
+
+
+class InstancePool:
+    """
+    The pool of many instances served by one shared connection pool.
+    Clients of the instances are created on first use and routed by the
+    instance ID.
+    """
+
+    def __init__(
+            self,
+            instances: Optional[Dict[str, str]] = None,
+            debug_mode: bool = False,
+            raise_errors: bool = False,
+            host: str = "https://api.green-api.com",
+            media: str = "https://media.green-api.com",
+            session: Optional[AsyncClient] = None,
+            log_body_limit: Optional[int] = 10000,
+            upload_cache: Optional[UploadCache] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            instruments: Optional[Iterable[Instrument]] = None,
+            coalesce: bool = True,
+            **session_options: Any
+    ):
+        self.debug_mode = debug_mode
+        self.raise_errors = raise_errors
+        self.host = host
+        self.media = media
+        self.log_body_limit = log_body_limit
+        self.upload_cache = upload_cache
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.instruments: List[Instrument] = list(instruments or ())
+        self.coalesce = coalesce
+
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(**session_options)
+        self.session = session
+
+        self._credentials: Dict[str, str] = {}
+        self._clients: Dict[str, AsyncGreenApi] = {}
+
+        for id_instance, api_token_instance in (instances or {}).items():
+            self.add(id_instance, api_token_instance)
+
+    def add(self, id_instance: str, api_token_instance: str) -> None:
+        id_instance = str(id_instance)
+
+        self._credentials[id_instance] = api_token_instance
+
+        client = self._clients.get(id_instance)
+        if client is not None:
+            client.api_token_instance = api_token_instance
+
+    def remove(self, id_instance: str) -> None:
+        id_instance = str(id_instance)
+
+        del self._credentials[id_instance]
+        self._clients.pop(id_instance, None)
+
+    def get(self, id_instance: str) -> AsyncGreenApi:
+        id_instance = str(id_instance)
+
+        client = self._clients.get(id_instance)
+        if client is None:
+            client = self._clients[id_instance] = AsyncGreenApi(
+                id_instance,
+                self._credentials[id_instance],
+                self.debug_mode,
+                self.raise_errors,
+                self.host,
+                self.media,
+                session=self.session,
+                log_body_limit=self.log_body_limit,
+                upload_cache=self.upload_cache,
+                retry_policy=self.retry_policy,
+                circuit_breaker=self.circuit_breaker,
+                instruments=self.instruments,
+                coalesce=self.coalesce
+            )
+
+        return client
+
+    def __getitem__(self, id_instance: str) -> AsyncGreenApi:
+        return self.get(id_instance)
+
+    def __contains__(self, id_instance: object) -> bool:
+        return str(id_instance) in self._credentials
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._credentials)
+
+    def __len__(self) -> int:
+        return len(self._credentials)
+
+    async def close(self) -> None:
+        if self._owns_session:
+            await self.session.aclose()
+
+    async def __aenter__(self) -> "InstancePool":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    The token bucket rate limiter. The rate is halved when the API
+    throttles requests and recovers step by step on successful ones.
+    """
+
+    def __init__(
+            self,
+            rate: float,
+            burst: Optional[int] = None,
+            min_rate: Optional[float] = None
+    ):
+        self.max_rate = self.rate = rate
+        self.min_rate = min_rate or rate / 20
+        self.capacity = burst or max(1, int(rate))
+
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return None
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def decrease(self) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def increase(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def update(self, status_code: Optional[int]) -> None:
+        """
+        Adjusts the rate to the status code of a response: it is raised on
+        success and lowered when the request failed, was throttled or
+        failed on the server. Other errors do not change it.
+        """
+
+        if status_code == 200:
+            self.increase()
+        elif status_code is None or status_code == 429 or status_code >= 500:
+            self.decrease()
@@ -1,15 +1,124 @@
-from json import loads
-from typing import Optional
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Optional, Union
+
+try:
+    from orjson import loads
+except ImportError:
+    try:
+        from ujson import loads
+    except ImportError:
+        from json import loads
+
+_UNSET: Any = object()
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
 
 
 class Response:
+    """
+    The response of the API. The body is kept as it was received and is
+    decoded on first access to ``data`` or ``error``.
+    """
+
+    __slots__ = ("code", "content", "_data", "_error")
+
     code: Optional[int]
-    data: Optional[dict] = None
-    error: Optional[str] = None
+    content: bytes
 
-    def __init__(self, code: Optional[int], text: str):
+    def __init__(self, code: Optional[int], content: Union[bytes, str]):
         self.code = code
-        if self.code == 200:
-            self.data = loads(text)
-        else:
-            self.error = text
+        if isinstance(content, str):
+            content = content.encode("UTF-8")
+        self.content = content
+
+        self._data = _UNSET
+        self._error = _UNSET
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("UTF-8", errors="replace")
+
+    @property
+    def data(self) -> Optional[Any]:
+        if self._data is _UNSET:
+            if self.code == 200:
+                self._data = loads(self.content)
+            else:
+                self._data = None
+
+        return self._data
+
+    @property
+    def error(self) -> Optional[str]:
+        if self._error is _UNSET:
+            if self.code != 200:
+                self._error = self.text
+            else:
+                self._error = None
+
+        return self._error
+
+    def __repr__(self) -> str:
+        return f"<Response [{self.code}]>"
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Decodes a JSON array from chunks of bytes and yields its items as
+    soon as they are complete, so only the current item and one chunk
+    are kept in memory. An item is yielded once the delimiter after it
+    has been received, as a number may continue in the next chunk.
+    """
+
+    decoder = codecs.getincrementaldecoder("UTF-8")()
+    buffer = ""
+    position = 0
+    started = False
+    finished = False
+
+    async for chunk in chunks:
+        if finished:
+            continue
+
+        buffer = buffer[position:] + decoder.decode(chunk)
+        position = 0
+
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+
+            character = buffer[position]
+            if not started:
+                if character != "[":
+                    raise ValueError(f"Expected a JSON array, got {character!r}.")
+                started = True
+                position += 1
+                continue
+            if character == "]":
+                finished = True
+                break
+            if character == ",":
+                position += 1
+                continue
+
+            try:
+                item, end = _decoder.raw_decode(buffer, position)
+            except ValueError:
+                # The item continues in the next chunk.
+                break
+
+            following = end
+            while following < len(buffer) and buffer[following] in _WHITESPACE:
+                following += 1
+            if following == len(buffer) or buffer[following] not in ",]":
+                break
+
+            position = end
+            yield item
+
+    if not finished:
+        raise ValueError("The JSON array is incomplete.")
@@ -0,0 +1,88 @@
+import random
+import time
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable, NamedTuple, Optional
+
+from httpx import ConnectError, ConnectTimeout, PoolTimeout
+
+from .routes import IDEMPOTENT_METHODS
+
+# Errors raised before a request is sent, so it was not processed.
+UNSENT_ERRORS = (ConnectError, ConnectTimeout, PoolTimeout)
+
+
+class RequestAttempt(NamedTuple):
+    method: Optional[str]
+    attempt: int
+    status_code: Optional[int]
+    error: Optional[Exception]
+    elapsed: float
+    delay: Optional[float]
+
+
+class RetryPolicy:
+    """
+    The policy of retrying failed requests with exponential backoff
+    and full jitter.
+
+    Requests that were not processed, failed to connect or throttled
+    with 429, are always retried. Timeouts and the other status codes
+    are retried only for the API methods of the policy, which are the
+    methods that do not change anything by default, so messages are not
+    sent twice.
+    """
+
+    def __init__(
+            self,
+            attempts: int = 3,
+            status_codes: Iterable[int] = (429, 500, 502, 503, 504),
+            methods: Iterable[str] = IDEMPOTENT_METHODS,
+            backoff: float = 0.5,
+            max_backoff: float = 30.0,
+            retry_after: bool = True
+    ):
+        self.attempts = attempts
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(methods)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_after = retry_after
+
+    def retryable(
+            self,
+            method: Optional[str],
+            status_code: Optional[int],
+            error: Optional[Exception]
+    ) -> bool:
+        if error is not None:
+            return isinstance(error, UNSENT_ERRORS) or method in self.methods
+        if status_code not in self.status_codes:
+            return False
+
+        return status_code == 429 or method in self.methods
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if self.retry_after and retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(self.max_backoff, seconds)
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_UNSET: Any = object()
+
+retry_override: ContextVar[Any] = ContextVar("retry_override", default=_UNSET)
@@ -0,0 +1,67 @@
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .API import AsyncGreenApi
+
+MEDIA_METHODS = frozenset({"sendFileByUpload", "uploadFile"})
+
+# Methods that are safe to repeat, they read data or are idempotent.
+IDEMPOTENT_METHODS = frozenset({
+    "getSettings",
+    "getWaSettings",
+    "getStateInstance",
+    "getStatusInstance",
+    "qr",
+    "getDeviceInfo",
+    "getGroupData",
+    "getChatHistory",
+    "getMessage",
+    "lastIncomingMessages",
+    "lastOutgoingMessages",
+    "showMessagesQueue",
+    "receiveNotification",
+    "deleteNotification",
+    "downloadFile",
+    "checkWhatsapp",
+    "getAvatar",
+    "getContacts",
+    "getContactInfo"
+})
+
+# Methods that only read data, identical concurrent requests of them
+# share one response.
+READ_ONLY_METHODS = IDEMPOTENT_METHODS - {"receiveNotification", "deleteNotification"}
+
+
+def method_name(url: str) -> Optional[str]:
+    """Returns the API method name of a method URL."""
+
+    _, _, path = url.partition("/waInstance")
+    parts = path.split("/", 2)
+
+    return parts[1] if len(parts) > 1 else None
+
+
+class Routes(dict):
+    """
+    The table of resolved method URLs of an instance keyed by the API
+    method name. URLs are built once on first use and the table is
+    cleared whenever the host or the credentials of the instance change.
+    """
+
+    def __init__(self, api: "AsyncGreenApi"):
+        super().__init__()
+        self.api = api
+
+    def __missing__(self, method: str) -> str:
+        if method in MEDIA_METHODS:
+            host = self.api.media
+        else:
+            host = self.api.host
+
+        url = self[method] = (
+            f"{host}/waInstance{self.api.id_instance}/"
+            f"{method}/{self.api.api_token_instance}"
+        )
+
+        return url
@@ -0,0 +1,268 @@
+import asyncio
+import hmac
+import inspect
+import logging
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from .response import loads
+
+Request = Tuple[str, str, Dict[str, str], bytes]
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large"
+}
+
+
+class PayloadTooLarge(ValueError):
+    pass
+
+
+class HeadersTooLarge(ValueError):
+    pass
+
+
+async def dispatch(
+        handler: Callable[[str, dict], Any], type_webhook: str, body: dict
+) -> None:
+    result = handler(type_webhook, body)
+    if inspect.isawaitable(result):
+        await result
+
+
+async def read_request(
+        reader: asyncio.StreamReader, max_body_size: int
+) -> Optional[Request]:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if not error.partial:
+            return None
+        raise
+    except asyncio.LimitOverrunError:
+        raise HeadersTooLarge("Request head is too large.") from None
+
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = request_line.split(" ", 2)
+
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        return method, target, headers, await read_chunked(reader, max_body_size)
+
+    content_length = int(headers.get("content-length", 0))
+    if content_length > max_body_size:
+        raise PayloadTooLarge("Request body is too large.")
+
+    body = b""
+    if content_length:
+        body = await reader.readexactly(content_length)
+
+    return method, target, headers, body
+
+
+async def read_chunked(reader: asyncio.StreamReader, max_body_size: int) -> bytes:
+    chunks = []
+    size = 0
+
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        chunk_size = int(line.split(b";", 1)[0], 16)
+        if not chunk_size:
+            break
+
+        size += chunk_size
+        if size > max_body_size:
+            raise PayloadTooLarge("Request body is too large.")
+
+        chunks.append(await reader.readexactly(chunk_size))
+        await reader.readexactly(2)
+
+    # Trailer fields are not used.
+    while await reader.readuntil(b"\r\n") != b"\r\n":
+        pass
+
+    return b"".join(chunks)
+
+
+def write_response(
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes = b"",
+        content_type: str = "application/json"
+) -> None:
+    writer.write((
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body)
+
+
+class WebhookServer:
+    """
+    The HTTP endpoint that accepts webhooks sent by Green-API. Accepted
+    notifications are put into a bounded queue that is handled by a
+    pool of workers, a full queue holds the reply to the sender back.
+    """
+
+    def __init__(
+            self,
+            handler: Callable[[str, dict], Any],
+            host: str = "0.0.0.0",
+            port: int = 8080,
+            path: str = "/",
+            workers: int = 1,
+            queue_size: Optional[int] = None,
+            token: Optional[str] = None,
+            max_body_size: int = 1024 * 1024,
+            logger: Optional[logging.Logger] = None
+    ):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers
+        self.token = token
+        self.max_body_size = max_body_size
+        self.logger = logger or logging.getLogger("whatsapp-api-client-python")
+
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size or workers * 2)
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._worker_tasks: Set[asyncio.Task] = set()
+        self._writers: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._closing: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        self._closing = asyncio.Event()
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+        for _ in range(self.workers):
+            self._worker_tasks.add(asyncio.create_task(self._work()))
+
+        self.logger.log(
+            logging.INFO,
+            "Started receiving webhooks on %s:%s%s.",
+            self.host, self.port, self.path
+        )
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return None
+
+        self._server.close()
+        connections = list(self._writers.items())
+        for writer, _ in connections:
+            writer.close()
+        await asyncio.gather(
+            *(task for _, task in connections), return_exceptions=True
+        )
+        await self._server.wait_closed()
+        self._server = None
+
+        await self.queue.join()
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+
+        self.logger.log(logging.INFO, "Stopped receiving webhooks.")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._closing.wait()
+        finally:
+            await self.stop()
+
+    def close(self) -> None:
+        """Makes serve_forever stop the server."""
+
+        if self._closing is not None:
+            self._closing.set()
+
+    async def _serve(
+            self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await read_request(reader, self.max_body_size)
+                except PayloadTooLarge:
+                    write_response(writer, 413)
+                    break
+                except HeadersTooLarge:
+                    write_response(writer, 431)
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Lines of chunked bodies longer than the buffer limit
+                    # overrun it as well.
+                    write_response(writer, 400)
+                    break
+                if request is None:
+                    break
+
+                method, target, headers, body = request
+
+                write_response(
+                    writer, await self._accept(method, target, headers, body)
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.pop(writer, None)
+            writer.close()
+
+    async def _accept(
+            self, method: str, target: str, headers: Dict[str, str], body: bytes
+    ) -> int:
+        if target.partition("?")[0] != self.path:
+            return 404
+        if method != "POST":
+            return 405
+
+        if self.token is not None:
+            authorization = headers.get("authorization", "").encode()
+            if not (
+                    hmac.compare_digest(authorization, f"Bearer {self.token}".encode())
+                    or hmac.compare_digest(authorization, self.token.encode())
+            ):
+                return 401
+
+        try:
+            notification = loads(body)
+            type_webhook = notification["typeWebhook"]
+        except (ValueError, TypeError, KeyError):
+            return 400
+
+        await self.queue.put((type_webhook, notification))
+
+        return 200
+
+    async def _work(self) -> None:
+        while True:
+            type_webhook, body = await self.queue.get()
+            try:
+                await dispatch(self.handler, type_webhook, body)
+            except Exception:
+                self.logger.exception("Webhook handler was failed with error.")
+            finally:
+                self.queue.task_done()
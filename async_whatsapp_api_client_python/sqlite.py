@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Union
+
+
+class Database:
+    """
+    The SQLite file shared by the worker threads of a store. It is opened
+    in WAL mode without implicit transactions, queries are serialized by
+    a lock and transactions are taken with BEGIN IMMEDIATE.
+    """
+
+    def __init__(
+            self,
+            path: Union[str, os.PathLike],
+            synchronous: Optional[str] = None
+    ):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        if synchronous is not None:
+            self._connection.execute(f"PRAGMA synchronous={synchronous}")
+
+    def execute(self, sql: str, parameters: tuple = ()) -> None:
+        with self._lock:
+            self._connection.execute(sql, parameters)
+
+    def fetchone(self, sql: str, parameters: tuple = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchone()
+
+    def fetchall(self, sql: str, parameters: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Runs the statements of the block in one transaction."""
+
+        with self._lock:
+            connection = self._connection
+
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, TYPE_CHECKING
+
+from .response import Response
+
+if TYPE_CHECKING:
+    from .API import AsyncGreenApi
+
+
+class Cached(NamedTuple):
+    value: Optional[Any]
+    updated_at: Optional[float]
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the value was received, None if it never was."""
+
+        if self.updated_at is None:
+            return None
+
+        return time.monotonic() - self.updated_at
+
+
+_MISSING = Cached(None, None)
+
+
+class AccountState:
+    """
+    The local copy of the state, the socket status and the settings of
+    the account, so the state can be checked before every send without
+    a request.
+
+    Values are refreshed in the background every interval once started
+    and are updated at once by stateInstanceChanged and
+    statusInstanceChanged notifications. Reads return the value with
+    its age, the getters request a value only when it is older than the
+    given bound.
+    """
+
+    def __init__(self, api: "AsyncGreenApi", interval: float = 60.0):
+        self.api = api
+        self.interval = interval
+
+        self._values: Dict[str, Cached] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def state_instance(self) -> Cached:
+        return self._values.get("stateInstance", _MISSING)
+
+    @property
+    def status_instance(self) -> Cached:
+        return self._values.get("statusInstance", _MISSING)
+
+    @property
+    def settings(self) -> Cached:
+        return self._values.get("settings", _MISSING)
+
+    async def get_state_instance(self, max_age: Optional[float] = 60.0) -> Optional[str]:
+        """
+        Returns the state of the account, it is requested if the stored
+        one is older than max_age seconds. None if it was not received.
+        """
+
+        return await self.__get(
+            "stateInstance", max_age, self.api.account.get_state_instance
+        )
+
+    async def get_status_instance(self, max_age: Optional[float] = 60.0) -> Optional[str]:
+        return await self.__get(
+            "statusInstance", max_age, self.api.account.get_status_instance
+        )
+
+    async def get_settings(self, max_age: Optional[float] = 60.0) -> Optional[dict]:
+        return await self.__get("settings", max_age, self.api.account.get_settings)
+
+    async def authorized(self, max_age: Optional[float] = 60.0) -> bool:
+        return await self.get_state_instance(max_age) == "authorized"
+
+    async def refresh(self) -> None:
+        """Requests the state, the status and the settings at once."""
+
+        await asyncio.gather(
+            self.__fetch("stateInstance", self.api.account.get_state_instance),
+            self.__fetch("statusInstance", self.api.account.get_status_instance),
+            self.__fetch("settings", self.api.account.get_settings)
+        )
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drops the stored value of the name, stateInstance, statusInstance
+        or settings, or all values.
+        """
+
+        if name is None:
+            self._values.clear()
+        else:
+            self._values.pop(name, None)
+
+    async def handle_notification(self, type_webhook: str, body: dict) -> None:
+        """Updates the state or the status from the notification."""
+
+        if type_webhook == "stateInstanceChanged":
+            name = "stateInstance"
+        elif type_webhook == "statusInstanceChanged":
+            name = "statusInstance"
+        else:
+            return None
+
+        value = body.get(name)
+        if value is not None:
+            self._values[name] = Cached(value, time.monotonic())
+
+    def start(self) -> None:
+        """Starts refreshing the values in the background."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def __aenter__(self) -> "AccountState":
+        self.start()
+
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                self.api.logger.exception("Account state refresh was failed with error.")
+
+            await asyncio.sleep(self.interval)
+
+    async def __get(
+            self,
+            name: str,
+            max_age: Optional[float],
+            request: Callable[[], Awaitable[Response]]
+    ) -> Optional[Any]:
+        cached = self._values.get(name, _MISSING)
+        age = cached.age
+        if age is not None and (max_age is None or age <= max_age):
+            return cached.value
+
+        await self.__fetch(name, request)
+
+        return self._values.get(name, _MISSING).value
+
+    async def __fetch(
+            self, name: str, request: Callable[[], Awaitable[Response]]
+    ) -> None:
+        requested_at = time.monotonic()
+
+        response = await request()
+        if response.code != 200:
+            return None
+
+        data = response.data
+        value = data.get(name) if name != "settings" and isinstance(data, dict) else data
+
+        # A notification received meanwhile is newer than the response.
+        cached = self._values.get(name)
+        if cached is None or cached.updated_at < requested_at:
+            self._values[name] = Cached(value, time.monotonic())
@@ -0,0 +1,275 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    Optional,
+    TypeVar
+)
+
+from .API import AsyncGreenAPI, AsyncGreenApi
+from .history import HistorySync
+from .metadata import MetadataCache
+from .outbox import Outbox
+from .retry import RetryPolicy
+from .state import AccountState
+from .tools import (
+    account,
+    device,
+    groups,
+    journals,
+    marking,
+    queues,
+    receiving,
+    sending,
+    serviceMethods,
+    webhooks
+)
+
+T = TypeVar("T")
+
+# Objects of the client with async methods, they are returned wrapped
+# in SyncProxy.
+PROXIED_TYPES = (
+    account.Account,
+    device.Device,
+    groups.Groups,
+    journals.Journals,
+    marking.Marking,
+    queues.Queues,
+    receiving.Receiving,
+    sending.Sending,
+    serviceMethods.ServiceMethods,
+    webhooks.Webhooks,
+    MetadataCache,
+    AccountState,
+    HistorySync,
+    Outbox
+)
+
+
+class EventLoopThread:
+    """
+    The event loop running in a daemon thread. Coroutines are run in it
+    from any thread, so one loop and one connection pool serve all the
+    threads of the process.
+    """
+
+    def __init__(self, name: str = "green-api-event-loop"):
+        self.loop = asyncio.new_event_loop()
+
+        self._thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self._thread.start()
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Runs the awaitable in the loop and waits for its result. Context
+        variables of the calling thread, e.g. the retry policy set by
+        AsyncGreenApi.retrying, are set for the awaitable as for a task.
+        """
+
+        if threading.current_thread() is self._thread:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise RuntimeError(
+                "The synchronous client cannot be called from its event loop thread,"
+                " use the asynchronous client there."
+            )
+
+        return asyncio.run_coroutine_threadsafe(
+            self.__await(awaitable, contextvars.copy_context()), self.loop
+        ).result()
+
+    def stop(self) -> None:
+        """Stops the loop and waits for the thread to finish."""
+
+        if self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+
+    def __run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    @staticmethod
+    async def __await(awaitable: Awaitable[T], context: contextvars.Context) -> T:
+        # The task runs in a copy of the context of the loop thread.
+        for variable, value in context.items():
+            variable.set(value)
+
+        return await awaitable
+
+
+class SyncProxy:
+    """
+    The synchronous view of an object of the asynchronous client. Its
+    methods are called in the event loop thread and their results are
+    waited for, async iterators are returned as SyncIterator.
+    """
+
+    def __init__(self, target: Any, loop_thread: EventLoopThread):
+        self._target = target
+        self._loop_thread = loop_thread
+        self._methods: Dict[str, Callable[..., Any]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        method = self._methods.get(name)
+        if method is not None:
+            return method
+
+        value = getattr(self._target, name)
+        if not callable(value):
+            return self._wrap(value)
+
+        @functools.wraps(value)
+        def method(*args: Any, **kwargs: Any) -> Any:
+            return self._wrap(self._loop_thread.run(self.__call(value, args, kwargs)))
+
+        self._methods[name] = method
+
+        return method
+
+    def __enter__(self) -> "SyncProxy":
+        aenter = getattr(self._target, "__aenter__", None)
+        if aenter is None:
+            raise TypeError(f"{type(self._target).__name__} is not a context manager.")
+
+        self._loop_thread.run(aenter())
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._loop_thread.run(self._target.__aexit__(*exc_info))
+
+    def __repr__(self) -> str:
+        return f"<SyncProxy of {self._target!r}>"
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, PROXIED_TYPES):
+            return SyncProxy(value, self._loop_thread)
+        if hasattr(value, "__anext__"):
+            return SyncIterator(value, self._loop_thread)
+
+        return value
+
+    @staticmethod
+    async def __call(
+            method: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]
+    ) -> Any:
+        result = method(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+
+        return result
+
+
+class SyncIterator:
+    """The synchronous iterator over an async iterator of the client."""
+
+    def __init__(self, iterator: AsyncIterator[T], loop_thread: EventLoopThread):
+        self._iterator = iterator
+        self._loop_thread = loop_thread
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return self._loop_thread.run(self._iterator.__anext__())
+        except StopAsyncIteration:
+            raise StopIteration from None
+
+    def close(self) -> None:
+        aclose = getattr(self._iterator, "aclose", None)
+        if aclose is not None:
+            self._loop_thread.run(aclose())
+
+    def __enter__(self) -> "SyncIterator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class SyncGreenApi(SyncProxy):
+    """
+    The synchronous client for code without an event loop, e.g. WSGI
+    views and task queue workers. It has the methods of AsyncGreenApi,
+    which are run in one long-lived event loop in a background thread,
+    so the connection pool is kept between calls and the client can be
+    shared by many threads. Several clients may share a loop thread.
+
+    Handlers of notifications are called in the loop thread and must not
+    call synchronous clients, as they would wait for the loop itself.
+    """
+
+    def __init__(
+            self,
+            id_instance: str,
+            api_token_instance: str,
+            loop_thread: Optional[EventLoopThread] = None,
+            **options: Any
+    ):
+        self._owns_loop_thread = loop_thread is None
+        if loop_thread is None:
+            loop_thread = EventLoopThread()
+
+        # The session is created in the loop that will use it.
+        api = loop_thread.run(
+            self.__create(id_instance, api_token_instance, options)
+        )
+
+        super().__init__(api, loop_thread)
+
+    @property
+    def api(self) -> AsyncGreenApi:
+        """The asynchronous client, its settings can be changed."""
+
+        return self._target
+
+    def retrying(self, retry_policy: Optional[RetryPolicy]) -> ContextManager[None]:
+        """
+        Overrides the retry policy of the requests made in the context by
+        the calling thread, see AsyncGreenApi.retrying.
+        """
+
+        return self._target.retrying(retry_policy)
+
+    def close(self) -> None:
+        """Closes the client and stops the loop thread if it owns it."""
+
+        self._loop_thread.run(self._target.close())
+
+        if self._owns_loop_thread:
+            self._loop_thread.stop()
+
+    def __enter__(self) -> "SyncGreenApi":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    async def __create(
+            id_instance: str, api_token_instance: str, options: Dict[str, Any]
+    ) -> AsyncGreenApi:
+        return AsyncGreenAPI(id_instance, api_token_instance, **options)
+
+
+class SyncGreenAPI(SyncGreenApi):
+    pass
@@ -1,7 +1,9 @@
-from pathlib import Path
-from typing import Dict, TYPE_CHECKING, Union
+from functools import cached_property
+from typing import Dict, Optional, TYPE_CHECKING, Union
 
 from ..response import Response
+from ..state import AccountState
+from ..uploads import File, Upload, encode_multipart
 
 if TYPE_CHECKING:
     from ..API import AsyncGreenApi
@@ -11,6 +13,18 @@ class Account:
     def __init__(self, api: "AsyncGreenApi"):
         self.api = api
 
+    @cached_property
+    def state(self) -> AccountState:
+        """
+        The local copy of the account state and settings, it is updated
+        by the notifications received by the client once it is used.
+        """
+
+        state = AccountState(self.api)
+        self.api.webhooks.notification_hooks.append(state.handle_notification)
+
+        return state
+
     async def get_settings(self) -> Response:
         """
         The method is aimed for getting the current account settings.
@@ -19,10 +33,7 @@ class Account:
         """
 
         return await self.api.request(
-            "GET", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "getSettings/{{api_token_instance}}"
-            )
+            "GET", self.api.routes["getSettings"]
         )
 
     async def get_wa_settings(self) -> Response:
@@ -34,10 +45,7 @@ class Account:
         """
 
         return await self.api.request(
-            "GET", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "getWaSettings/{{api_token_instance}}"
-            )
+            "GET", self.api.routes["getWaSettings"]
         )
 
     async def set_settings(self, request_body: Dict[str, Union[int, str]]) -> Response:
@@ -47,12 +55,12 @@ class Account:
         https://green-api.com/en/docs/api/account/SetSettings/
         """
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "setSettings/{{api_token_instance}}"
-            ), request_body
+        response = await self.api.request(
+            "POST", self.api.routes["setSettings"], request_body
         )
+        self.__invalidate(response, "settings")
+
+        return response
 
     async def get_state_instance(self) -> Response:
         """
@@ -62,10 +70,7 @@ class Account:
         """
 
         return await self.api.request(
-            "GET", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "getStateInstance/{{api_token_instance}}"
-            )
+            "GET", self.api.routes["getStateInstance"]
         )
 
     async def get_status_instance(self) -> Response:
@@ -77,10 +82,7 @@ class Account:
         """
 
         return await self.api.request(
-            "GET", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "getStatusInstance/{{api_token_instance}}"
-            )
+            "GET", self.api.routes["getStatusInstance"]
         )
 
     async def reboot(self) -> Response:
@@ -90,11 +92,12 @@ class Account:
         https://green-api.com/en/docs/api/account/Reboot/
         """
 
-        return await self.api.request(
-            "GET", (
-                "{{host}}/waInstance{{id_instance}}/reboot/{{api_token_instance}}"
-            )
+        response = await self.api.request(
+            "GET", self.api.routes["reboot"]
         )
+        self.__invalidate(response)
+
+        return response
 
     async def logout(self) -> Response:
         """
@@ -103,11 +106,12 @@ class Account:
         https://green-api.com/en/docs/api/account/Logout/
         """
 
-        return await self.api.request(
-            "GET", (
-                "{{host}}/waInstance{{id_instance}}/logout/{{api_token_instance}}"
-            )
+        response = await self.api.request(
+            "GET", self.api.routes["logout"]
         )
+        self.__invalidate(response)
+
+        return response
 
     async def qr(self) -> Response:
         """
@@ -117,24 +121,25 @@ class Account:
         """
 
         return await self.api.request(
-            "GET", "{{host}}/waInstance{{id_instance}}/qr/{{api_token_instance}}"
+            "GET", self.api.routes["qr"]
         )
 
-    async def set_profile_picture(self, path: str) -> Response:
+    async def set_profile_picture(self, path: File) -> Response:
         """
         The method is aimed for setting an account picture.
 
         https://green-api.com/en/docs/api/account/SetProfilePicture/
         """
 
-        file_name = Path(path).name
-        files = {"file": (file_name, open(path, "rb"), "image/jpeg")}
+        headers, content = await encode_multipart(
+            {}, "file", Upload(path, content_type="image/jpeg")
+        )
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "setProfilePicture/{{api_token_instance}}"
-            ), files=files
+        return await self.api.raw_request(
+            method="POST",
+            url=self.api.routes["setProfilePicture"],
+            content=content,
+            headers=headers
         )
 
     async def get_authorization_code(self, phone_number: int) -> Response:
@@ -147,8 +152,10 @@ class Account:
         request_body = {"phoneNumber": phone_number}
 
         return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "getAuthorizationCode/{{api_token_instance}}"
-            ), request_body
+            "POST", self.api.routes["getAuthorizationCode"], request_body
         )
+
+    def __invalidate(self, response: Response, name: Optional[str] = None) -> None:
+        state = self.__dict__.get("state")
+        if state is not None and response.code == 200:
+            state.invalidate(name)
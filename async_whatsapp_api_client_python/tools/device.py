@@ -19,8 +19,5 @@ class Device:
         """
 
         return await self.api.request(
-            "GET", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "getDeviceInfo/{{api_token_instance}}"
-            )
+            "GET", self.api.routes["getDeviceInfo"]
         )
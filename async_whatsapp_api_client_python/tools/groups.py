@@ -1,7 +1,7 @@
-from pathlib import Path
 from typing import List, TYPE_CHECKING
 
 from ..response import Response
+from ..uploads import File, Upload, encode_multipart
 
 if TYPE_CHECKING:
     from ..API import AsyncGreenApi
@@ -23,10 +23,7 @@ class Groups:
         })
 
         return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "createGroup/{{api_token_instance}}"
-            ), request_body
+            "POST", self.api.routes["createGroup"], request_body
         )
 
     async def update_group_name(self, group_id: str, group_name: str) -> Response:
@@ -40,12 +37,12 @@ class Groups:
             "groupId": group_id, "groupName": group_name
         })
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "updateGroupName/{{api_token_instance}}"
-            ), request_body
+        response = await self.api.request(
+            "POST", self.api.routes["updateGroupName"], request_body
         )
+        await self.__invalidate(group_id, response)
+
+        return response
 
     async def get_group_data(self, group_id: str) -> Response:
         """
@@ -59,10 +56,7 @@ class Groups:
         })
 
         return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "getGroupData/{{api_token_instance}}"
-            ), request_body
+            "POST", self.api.routes["getGroupData"], request_body
         )
 
     async def add_group_participant(
@@ -78,12 +72,12 @@ class Groups:
             "groupId": group_id, "participantChatId": participant_chat_id
         })
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "addGroupParticipant/{{api_token_instance}}"
-            ), request_body
+        response = await self.api.request(
+            "POST", self.api.routes["addGroupParticipant"], request_body
         )
+        await self.__invalidate(group_id, response)
+
+        return response
 
     async def remove_group_participant(
             self, group_id: str, participant_chat_id: str
@@ -98,12 +92,12 @@ class Groups:
             "groupId": group_id, "participantChatId": participant_chat_id
         })
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "removeGroupParticipant/{{api_token_instance}}"
-            ), request_body
+        response = await self.api.request(
+            "POST", self.api.routes["removeGroupParticipant"], request_body
         )
+        await self.__invalidate(group_id, response)
+
+        return response
 
     async def set_group_admin(self, group_id: str, participant_chat_id: str) -> Response:
         """
@@ -116,12 +110,12 @@ class Groups:
             "groupId": group_id, "participantChatId": participant_chat_id
         })
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "setGroupAdmin/{{api_token_instance}}"
-            ), request_body
+        response = await self.api.request(
+            "POST", self.api.routes["setGroupAdmin"], request_body
         )
+        await self.__invalidate(group_id, response)
+
+        return response
 
     async def remove_admin(self, group_id: str, participant_chat_id: str) -> Response:
         """
@@ -135,14 +129,14 @@ class Groups:
             "groupId": group_id, "participantChatId": participant_chat_id
         })
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "removeAdmin/{{api_token_instance}}"
-            ), request_body
+        response = await self.api.request(
+            "POST", self.api.routes["removeAdmin"], request_body
         )
+        await self.__invalidate(group_id, response)
+
+        return response
 
-    async def set_group_picture(self, group_id: str, path: str) -> Response:
+    async def set_group_picture(self, group_id: str, path: File) -> Response:
         """
         The method sets a group picture.
 
@@ -151,15 +145,19 @@ class Groups:
 
         request_body = self.__handle_parameters({"groupId": group_id})
 
-        file_name = Path(path).name
-        files = {"file": (file_name, open(path, "rb"), "image/jpeg")}
+        headers, content = await encode_multipart(
+            request_body, "file", Upload(path, content_type="image/jpeg")
+        )
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "setGroupPicture/{{api_token_instance}}"
-            ), request_body, files
+        response = await self.api.raw_request(
+            method="POST",
+            url=self.api.routes["setGroupPicture"],
+            content=content,
+            headers=headers
         )
+        await self.__invalidate(group_id, response)
+
+        return response
 
     async def leave_group(self, group_id: str) -> Response:
         """
@@ -170,12 +168,17 @@ class Groups:
 
         request_body = self.__handle_parameters({"groupId": group_id})
 
-        return await self.api.request(
-            "POST", (
-                "{{host}}/waInstance{{id_instance}}/"
-                "leaveGroup/{{api_token_instance}}"
-            ), request_body
+        response = await self.api.request(
+            "POST", self.api.routes["leaveGroup"], request_body
         )
+        await self.__invalidate(group_id, response)
+
+        return response
+
+    async def __invalidate(self, group_id: str, response: Response) -> None:
+        metadata = self.api.__dict__.get("metadata")
+        if metadata is not None and response.code == 200:
+            await metadata.invalidate_group(group_id)
 
     @classmethod
     def __handle_parameters(cls, parameters: dict) -> dict:
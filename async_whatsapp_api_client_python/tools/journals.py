@@ -1,5 +1,7 @@
-from typing import Optional, TYPE_CHECKING
+import os
+from typing import Any, AsyncIterator, Optional, TYPE_CHECKING, Union
 
+from ..history import HistorySync
 from ..response import Response
 
 if TYPE_CHECKING:
@@ -22,7 +24,7 @@ class Journals:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/getChatHistory/{{api_token_instance}}",
+            self.api.routes["getChatHistory"],
             request_body,
         )
 
@@ -36,7 +38,7 @@ class Journals:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/getMessage/{{api_token_instance}}",
+            self.api.routes["getMessage"],
             request_body,
         )
 
@@ -50,7 +52,7 @@ class Journals:
 
         return await self.api.request(
             "GET",
-            "{{host}}/waInstance{{id_instance}}/lastIncomingMessages/{{api_token_instance}}",
+            self.api.routes["lastIncomingMessages"],
             request_body,
         )
 
@@ -64,6 +66,67 @@ class Journals:
 
         return await self.api.request(
             "GET",
-            "{{host}}/waInstance{{id_instance}}/lastOutgoingMessages/{{api_token_instance}}",
+            self.api.routes["lastOutgoingMessages"],
             request_body,
         )
+
+    def iter_chat_history(
+            self, chat_id: str, count: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """
+        The method yields the chat message history as it is received,
+        see AsyncGreenApi.stream_request.
+
+        https://green-api.com/en/docs/api/journals/GetChatHistory/
+        """
+        request_body = {"chatId": chat_id}
+        if count is not None:
+            request_body["count"] = count
+
+        return self.api.stream_request(
+            "POST",
+            self.api.routes["getChatHistory"],
+            request_body,
+        )
+
+    def iter_last_incoming_messages(
+            self, minutes: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """
+        The method yields the last incoming messages of the account as
+        they are received, see AsyncGreenApi.stream_request.
+
+        https://green-api.com/en/docs/api/journals/LastIncomingMessages/
+        """
+        request_body = {"minutes": minutes} if minutes is not None else None
+
+        return self.api.stream_request(
+            "GET",
+            self.api.routes["lastIncomingMessages"],
+            request_body,
+        )
+
+    def iter_last_outgoing_messages(
+            self, minutes: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """
+        The method yields the last outgoing messages of the account as
+        they are received, see AsyncGreenApi.stream_request.
+
+        https://green-api.com/en/docs/api/journals/LastOutgoingMessages/
+        """
+        request_body = {"minutes": minutes} if minutes is not None else None
+
+        return self.api.stream_request(
+            "GET",
+            self.api.routes["lastOutgoingMessages"],
+            request_body,
+        )
+
+    def history(self, path: Union[str, os.PathLike], **options: Any) -> HistorySync:
+        """
+        The method opens the local copy of the chat history stored in an
+        SQLite file at the path, see HistorySync.
+        """
+
+        return HistorySync(self.api, path, **options)
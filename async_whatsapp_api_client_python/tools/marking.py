@@ -22,6 +22,6 @@ class Marking:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/readChat/{{api_token_instance}}",
+            self.api.routes["readChat"],
             request_body,
         )
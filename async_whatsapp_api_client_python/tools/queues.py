@@ -19,7 +19,7 @@ class Queues:
         """
         return await self.api.request(
             "GET",
-            "{{host}}/waInstance{{id_instance}}/showMessagesQueue/{{api_token_instance}}",
+            self.api.routes["showMessagesQueue"],
         )
 
     async def clear_messages_queue(self) -> Response:
@@ -31,5 +31,5 @@ class Queues:
         """
         return await self.api.request(
             "GET",
-            "{{host}}/waInstance{{id_instance}}/clearMessagesQueue/{{api_token_instance}}",
+            self.api.routes["clearMessagesQueue"],
         )
@@ -1,10 +1,30 @@
-from typing import TYPE_CHECKING
+import asyncio
+import hashlib
+import os
+import pathlib
+import re
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Iterable,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Union
+)
 
+from ..concurrency import imap_unordered
 from ..response import Response
 
 if TYPE_CHECKING:
     from ..API import AsyncGreenApi
 
+Destination = Union[str, os.PathLike, BinaryIO]
+
+CHUNK_SIZE = 256 * 1024
+
 
 class Receiving:
     def __init__(self, api: "AsyncGreenApi"):
@@ -19,7 +39,7 @@ class Receiving:
         """
         return await self.api.request(
             "GET",
-            "{{host}}/waInstance{{id_instance}}/receiveNotification/{{api_token_instance}}",
+            self.api.routes["receiveNotification"],
         )
 
     async def delete_notification(self, receipt_id: int) -> Response:
@@ -29,7 +49,7 @@ class Receiving:
 
         https://green-api.com/en/docs/api/receiving/technology-http-api/DeleteNotification/
         """
-        url = "{{host}}/waInstance{{id_instance}}/deleteNotification/{{api_token_instance}}"
+        url = self.api.routes["deleteNotification"]
         return await self.api.request("DELETE", f"{url}/{receipt_id}")
 
     async def download_file(self, chat_id: str, id_message: str) -> Response:
@@ -41,6 +61,233 @@ class Receiving:
         request_body = {"chatId": chat_id, "idMessage": id_message}
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/downloadFile/{{api_token_instance}}",
+            self.api.routes["downloadFile"],
             request_body,
         )
+
+    async def download_media(
+            self,
+            chat_id: str,
+            id_message: str,
+            dest: Destination,
+            checksum: Optional[str] = None,
+            algorithm: str = "sha256",
+            resume: bool = True,
+            chunk_size: int = CHUNK_SIZE
+    ) -> Response:
+        """
+        The method downloads the file of a message and writes it to a
+        path or a binary file object chunk by chunk.
+
+        A file is written to a path next to it with the ".part" suffix
+        and is moved into place once complete. An interrupted download
+        is resumed from that file by a range request if the file has not
+        changed since, by its ETag or Last-Modified, otherwise it is
+        downloaded again. The checksum is the hex digest of the file by
+        the algorithm.
+
+        Returns the response of the downloadFile method.
+        """
+
+        response = await self.download_file(chat_id, id_message)
+        if response.code != 200:
+            return response
+
+        url = (response.data or {}).get("downloadUrl")
+        if not url:
+            return self.api.handle_error(
+                f"Message {id_message} has no file to download."
+            )
+
+        digest = None
+        try:
+            if checksum:
+                digest = hashlib.new(algorithm)
+
+            if isinstance(dest, (str, os.PathLike)):
+                error_message = await self.__download_to_path(
+                    url, pathlib.Path(dest), digest, resume, chunk_size
+                )
+            else:
+                error_message = await self.__download(url, dest, digest, chunk_size)
+        except Exception as error:
+            error_message = f"Media download was failed with error: {error}."
+
+        if error_message is None and digest is not None:
+            if digest.hexdigest() != checksum.lower():
+                error_message = (
+                    f"Media download was failed with checksum mismatch:"
+                    f" {digest.hexdigest()} instead of {checksum}."
+                )
+                if isinstance(dest, (str, os.PathLike)):
+                    await asyncio.to_thread(os.remove, dest)
+
+        if error_message is not None:
+            return self.api.handle_error(error_message)
+
+        return response
+
+    def download_media_many(
+            self,
+            messages: Union[
+                Iterable[Tuple[str, str, Destination]],
+                AsyncIterable[Tuple[str, str, Destination]]
+            ],
+            concurrency: int = 4,
+            **options: Any
+    ) -> AsyncIterator[Tuple[Tuple[str, str, Destination], Response]]:
+        """
+        The method downloads the files of many messages concurrently,
+        messages are tuples of the arguments of download_media. Pairs of
+        the message and its response are yielded as they complete.
+        """
+
+        async def download(message: Tuple[str, str, Destination]) -> Response:
+            return await self.download_media(*message, **options)
+
+        return imap_unordered(download, messages, concurrency)
+
+    async def __download_to_path(
+            self,
+            url: str,
+            path: pathlib.Path,
+            digest: Optional[Any],
+            resume: bool,
+            chunk_size: int
+    ) -> Optional[str]:
+        part = path.with_name(f"{path.name}.part")
+
+        offset, validator = 0, None
+        if resume:
+            offset, validator = await asyncio.to_thread(read_part, part)
+
+        file = await asyncio.to_thread(open, part, "ab" if offset else "wb")
+        try:
+            error_message = await self.__download(
+                url, file, digest, chunk_size, part, offset, validator
+            )
+        finally:
+            file.close()
+
+        if error_message is None:
+            await asyncio.to_thread(os.replace, part, path)
+            await asyncio.to_thread(write_validator, part, None)
+
+        return error_message
+
+    async def __download(
+            self,
+            url: str,
+            file: BinaryIO,
+            digest: Optional[Any],
+            chunk_size: int,
+            part: Optional[pathlib.Path] = None,
+            offset: int = 0,
+            validator: Optional[str] = None
+    ) -> Optional[str]:
+        headers = {}
+        if offset:
+            # The range is ignored and the whole file is returned if the
+            # file has changed since the part was downloaded.
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        restart = False
+        async with self.api.session.stream("GET", url, headers=headers) as media:
+            start, size = parse_content_range(media.headers.get("Content-Range"))
+
+            if offset and (
+                    media.status_code == 206 and start == offset
+                    or media.status_code == 416 and size == offset
+            ):
+                # The download continues the part, which is complete
+                # already if the range is not satisfiable.
+                if digest is not None:
+                    await asyncio.to_thread(hash_file, part, digest, chunk_size)
+                if media.status_code == 416:
+                    return None
+            elif media.status_code == 200:
+                if offset:
+                    await asyncio.to_thread(file.truncate, 0)
+                if part is not None:
+                    await asyncio.to_thread(
+                        write_validator, part, response_validator(media.headers)
+                    )
+            elif offset and media.status_code in (206, 416):
+                # The part is not the beginning of this file.
+                restart = True
+            else:
+                return f"Media download was failed with status code: {media.status_code}."
+
+            if not restart:
+                async for chunk in media.aiter_bytes(chunk_size):
+                    if digest is not None:
+                        digest.update(chunk)
+                    await asyncio.to_thread(file.write, chunk)
+
+                return None
+
+        await asyncio.to_thread(file.truncate, 0)
+
+        return await self.__download(url, file, digest, chunk_size, part)
+
+
+def parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Returns the first byte and the size of the file by the Content-Range header."""
+
+    match = re.fullmatch(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)", (value or "").strip())
+    if match is None:
+        return None, None
+
+    start, size = match.groups()
+
+    return (
+        int(start) if start is not None else None,
+        int(size) if size != "*" else None
+    )
+
+
+def response_validator(headers: Any) -> Optional[str]:
+    """Returns the strong ETag or Last-Modified for the If-Range header."""
+
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+
+    return headers.get("Last-Modified")
+
+
+def read_part(part: pathlib.Path) -> Tuple[int, Optional[str]]:
+    """
+    Returns the size of the part and the validator of the file it was
+    downloaded from. A part without the validator is downloaded again.
+    """
+
+    try:
+        validator = validator_path(part).read_text().strip()
+        size = os.stat(part).st_size
+    except FileNotFoundError:
+        return 0, None
+
+    if not validator:
+        return 0, None
+
+    return size, validator
+
+
+def write_validator(part: pathlib.Path, validator: Optional[str]) -> None:
+    path = validator_path(part)
+    if validator:
+        path.write_text(validator)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def validator_path(part: pathlib.Path) -> pathlib.Path:
+    return part.with_name(f"{part.name}.validator")
+
+
+def hash_file(path: pathlib.Path, digest: Any, chunk_size: int) -> None:
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
@@ -1,8 +1,24 @@
-import mimetypes
-import pathlib
-from typing import Dict, List, Optional, TYPE_CHECKING, Union
-
+import json
+import os
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Union
+)
+
+from ..concurrency import imap_unordered
+from ..outbox import Outbox
+from ..ratelimit import TokenBucket
 from ..response import Response
+from ..retry import RetryPolicy
+from ..uploads import File, Upload, encode_multipart
 
 if TYPE_CHECKING:
     from ..API import AsyncGreenApi
@@ -31,7 +47,7 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendMessage/{{api_token_instance}}",
+            self.api.routes["sendMessage"],
             request_body,
         )
 
@@ -55,7 +71,7 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendButtons/{{api_token_instance}}",
+            self.api.routes["sendButtons"],
             request_body,
         )
 
@@ -79,7 +95,7 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendTemplateButtons/{{api_token_instance}}",
+            self.api.routes["sendTemplateButtons"],
             request_body,
         )
 
@@ -105,14 +121,14 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendListMessage/{{api_token_instance}}",
+            self.api.routes["sendListMessage"],
             request_body,
         )
 
     async def send_file_by_upload(
             self,
             chat_id: str,
-            path: str,
+            path: File,
             file_name: Optional[str] = None,
             caption: Optional[str] = None,
             quoted_message_id: Optional[str] = None,
@@ -121,25 +137,42 @@ class Sending:
         The method is aimed for sending a file uploaded by form
         (form-data).
 
+        The file may be a path, bytes, a file object or an async
+        iterable of bytes, it is streamed in chunks. With an upload cache
+        a file that was uploaded before is sent by its URL instead.
+
         https://green-api.com/en/docs/api/sending/SendFileByUpload/
         """
 
         request_body = self.__handle_parameters(locals())
 
-        file_name = pathlib.Path(path).name
-        content_type = mimetypes.guess_type(file_name)[0]
+        request_body.pop("path")
 
-        files = {"file": (file_name, open(path, "rb"), content_type)}
+        upload = Upload(path, file_name)
 
-        request_body.pop("path")
+        cache, key = self.api.upload_cache, None
+        if cache is not None:
+            key = await cache.key(path)
+            url_file = key and await cache.get(key)
+            if url_file:
+                return await self.send_file_by_url(
+                    chat_id, url_file, upload.file_name, caption, quoted_message_id
+                )
 
-        return await self.api.request(
-            "POST",
-            "{{media}}/waInstance{{id_instance}}/sendFileByUpload/{{api_token_instance}}",
-            request_body,
-            files,
+        headers, content = await encode_multipart(request_body, "file", upload)
+
+        response = await self.api.raw_request(
+            method="POST",
+            url=self.api.routes["sendFileByUpload"],
+            content=content,
+            headers=headers,
         )
 
+        if key is not None:
+            await self.__cache_upload(key, response)
+
+        return response
+
     async def send_file_by_url(
             self,
             chat_id: str,
@@ -159,31 +192,56 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendFileByUrl/{{api_token_instance}}",
+            self.api.routes["sendFileByUrl"],
             request_body,
         )
 
-    async def upload_file(self, path: str) -> Response:
+    async def upload_file(
+            self, path: File, file_name: Optional[str] = None
+    ) -> Response:
         """
         The method is designed to upload a file to the cloud storage,
         which can be sent using the sendFileByUrl method.
 
+        The file may be a path, bytes, a file object or an async
+        iterable of bytes, it is streamed in chunks. With an upload cache
+        the URL of a file that was uploaded before is returned instead.
+
         https://green-api.com/en/docs/api/sending/UploadFile/
         """
 
-        file_name = pathlib.Path(path).name
-        content_type = mimetypes.guess_type(file_name)[0]
+        cache, key = self.api.upload_cache, None
+        if cache is not None:
+            key = await cache.key(path)
+            url_file = key and await cache.get(key)
+            if url_file:
+                return Response(200, json.dumps({"urlFile": url_file}))
+
+        upload = Upload(path, file_name)
+
+        headers = {"Content-Type": upload.content_type}
+
+        size = await upload.size()
+        if size is not None:
+            headers["Content-Length"] = str(size)
+
+        response = await self.api.raw_request(
+            method="POST",
+            url=self.api.routes["uploadFile"],
+            content=upload,
+            headers=headers,
+        )
 
-        with open(path, "rb") as file:
-            return await self.api.raw_request(
-                method="POST",
-                url=(
-                    f"{self.api.media}/waInstance{self.api.id_instance}/"
-                    f"uploadFile/{self.api.api_token_instance}"
-                ),
-                data=file.read(),
-                headers={"Content-Type": content_type},
-            )
+        if key is not None:
+            await self.__cache_upload(key, response)
+
+        return response
+
+    async def __cache_upload(self, key: str, response: Response) -> None:
+        if response.code == 200:
+            url_file = (response.data or {}).get("urlFile")
+            if url_file:
+                await self.api.upload_cache.set(key, url_file)
 
     async def send_location(
             self,
@@ -204,7 +262,7 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendLocation/{{api_token_instance}}",
+            self.api.routes["sendLocation"],
             request_body,
         )
 
@@ -221,7 +279,7 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendContact/{{api_token_instance}}",
+            self.api.routes["sendContact"],
             request_body,
         )
 
@@ -241,7 +299,7 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendLink/{{api_token_instance}}",
+            self.api.routes["sendLink"],
             request_body,
         )
 
@@ -259,7 +317,7 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/forwardMessages/{{api_token_instance}}",
+            self.api.routes["forwardMessages"],
             request_body,
         )
 
@@ -282,10 +340,92 @@ class Sending:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/sendPoll/{{api_token_instance}}",
+            self.api.routes["sendPoll"],
             request_body,
         )
 
+    def send_many(
+            self,
+            messages: Union[Iterable[dict], AsyncIterable[dict]],
+            concurrency: int = 10,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+            retries: int = 3,
+            backoff: float = 1.0
+    ) -> AsyncIterator[Tuple[dict, Response]]:
+        """
+        The method sends many messages concurrently and yields pairs of
+        the message and its response as they complete.
+
+        A message is a dictionary of arguments of a sending method, the
+        method is set by the "method" key and is send_message by
+        default. The rate limits requests per second, it is lowered when
+        the API throttles requests or fails and restored afterwards.
+
+        Requests that were not processed, throttled with 429 or failed to
+        connect, are retried with backoff by a RetryPolicy that replaces
+        the policy of the client meanwhile. Server errors are not
+        retried, as the message may have been sent.
+        """
+
+        limiter = TokenBucket(rate, burst) if rate else None
+        retry_policy = RetryPolicy(attempts=retries + 1, methods=(), backoff=backoff)
+
+        async def send(message: dict) -> Response:
+            with self.api.retrying(retry_policy):
+                return await self.__send_limited(message, limiter)
+
+        return imap_unordered(send, messages, concurrency)
+
+    def broadcast(
+            self,
+            chat_ids: Union[Iterable[str], AsyncIterable[str]],
+            message: str,
+            concurrency: int = 10,
+            rate: Optional[float] = None,
+            **arguments: Any
+    ) -> AsyncIterator[Tuple[dict, Response]]:
+        """
+        The method sends the same text message to many chats, see
+        send_many.
+        """
+
+        if isinstance(chat_ids, AsyncIterable):
+            async def messages() -> AsyncIterator[dict]:
+                async for chat_id in chat_ids:
+                    yield {"chat_id": chat_id, "message": message, **arguments}
+
+            return self.send_many(messages(), concurrency, rate)
+
+        return self.send_many((
+            {"chat_id": chat_id, "message": message, **arguments}
+            for chat_id in chat_ids
+        ), concurrency, rate)
+
+    def outbox(self, path: Union[str, os.PathLike], **options: Any) -> Outbox:
+        """
+        The method opens the durable outbox of messages stored in an
+        SQLite file at the path, see Outbox.
+        """
+
+        return Outbox(self.api, path, **options)
+
+    async def __send_limited(
+            self, message: dict, limiter: Optional[TokenBucket]
+    ) -> Response:
+        arguments = message.copy()
+        method = getattr(self, arguments.pop("method", "send_message"))
+
+        if limiter is not None:
+            await limiter.acquire()
+
+        response = await method(**arguments)
+
+        if limiter is not None:
+            limiter.update(response.code)
+
+        return response
+
     @classmethod
     def __handle_parameters(cls, parameters: dict) -> dict:
         handled_parameters = {}
@@ -1,15 +1,36 @@
-from typing import Optional, TYPE_CHECKING
-
+import json
+import re
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Union
+)
+
+from ..cache import CacheBackend, MemoryCache
+from ..concurrency import imap_unordered
+from ..ratelimit import TokenBucket
 from ..response import Response
 
 if TYPE_CHECKING:
     from ..API import AsyncGreenApi
 
 
+PhoneNumber = Union[int, str]
+
+NON_DIGITS = re.compile(r"\D")
+
+
 class ServiceMethods:
     def __init__(self, api: "AsyncGreenApi"):
         self.api = api
 
+        self.check_whatsapp_cache: CacheBackend = MemoryCache()
+
     async def check_whatsapp(self, phone_number: int) -> Response:
         """
         The method checks WhatsApp account availability on a phone
@@ -22,10 +43,60 @@ class ServiceMethods:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/checkWhatsapp/{{api_token_instance}}",
+            self.api.routes["checkWhatsapp"],
             request_body,
         )
 
+    def check_whatsapp_many(
+            self,
+            phone_numbers: Union[Iterable[PhoneNumber], AsyncIterable[PhoneNumber]],
+            concurrency: int = 10,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+            cache: Optional[CacheBackend] = None,
+            ttl: Optional[float] = 7 * 24 * 60 * 60,
+            negative_ttl: Optional[float] = 24 * 60 * 60
+    ) -> AsyncIterator[Tuple[int, Response]]:
+        """
+        The method checks WhatsApp account availability on many phone
+        numbers concurrently and yields pairs of the phone number and
+        its response as they complete.
+
+        Phone numbers are normalized to digits, so "+7 (900) 123-45-67"
+        and "79001234567@c.us" are the same number, and each number is
+        checked once. Numbers without digits are skipped. Results are
+        cached in check_whatsapp_cache or the given cache, numbers
+        without an account for the shorter negative TTL. The rate limits
+        requests per second as in Sending.send_many.
+        """
+
+        if cache is None:
+            cache = self.check_whatsapp_cache
+        limiter = TokenBucket(rate, burst) if rate else None
+
+        async def check(phone_number: int) -> Response:
+            key = f"checkWhatsapp:{phone_number}"
+
+            exists = await cache.get(key)
+            if exists is not None:
+                return Response(200, json.dumps({"existsWhatsapp": exists}))
+
+            if limiter is not None:
+                await limiter.acquire()
+
+            response = await self.check_whatsapp(phone_number)
+            if limiter is not None:
+                limiter.update(response.code)
+
+            if response.code == 200:
+                exists = (response.data or {}).get("existsWhatsapp")
+                if isinstance(exists, bool):
+                    await cache.set(key, exists, ttl if exists else negative_ttl)
+
+            return response
+
+        return imap_unordered(check, unique_phone_numbers(phone_numbers), concurrency)
+
     async def get_avatar(self, chat_id: str) -> Response:
         """
         The method returns a user or a group chat avatar.
@@ -37,7 +108,7 @@ class ServiceMethods:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/getAvatar/{{api_token_instance}}",
+            self.api.routes["getAvatar"],
             request_body,
         )
 
@@ -51,9 +122,19 @@ class ServiceMethods:
 
         return await self.api.request(
             "GET",
-            "{{host}}/waInstance{{id_instance}}/getContacts/{{api_token_instance}}",
+            self.api.routes["getContacts"],
         )
 
+    def iter_contacts(self) -> AsyncIterator[Any]:
+        """
+        The method yields the contacts of the current account as they
+        are received, see AsyncGreenApi.stream_request.
+
+        https://green-api.com/en/docs/api/service/GetContacts/
+        """
+
+        return self.api.stream_request("GET", self.api.routes["getContacts"])
+
     async def get_contact_info(self, chat_id: str) -> Response:
         """
         The method is aimed for getting information on a contact.
@@ -65,7 +146,7 @@ class ServiceMethods:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/getContactInfo/{{api_token_instance}}",
+            self.api.routes["getContactInfo"],
             request_body,
         )
 
@@ -80,7 +161,7 @@ class ServiceMethods:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/deleteMessage/{{api_token_instance}}",
+            self.api.routes["deleteMessage"],
             request_body,
         )
 
@@ -95,7 +176,7 @@ class ServiceMethods:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/archiveChat/{{api_token_instance}}",
+            self.api.routes["archiveChat"],
             request_body,
         )
 
@@ -110,7 +191,7 @@ class ServiceMethods:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/unarchiveChat/{{api_token_instance}}",
+            self.api.routes["unarchiveChat"],
             request_body,
         )
 
@@ -128,7 +209,7 @@ class ServiceMethods:
 
         return await self.api.request(
             "POST",
-            "{{host}}/waInstance{{id_instance}}/setDisappearingChat/{{api_token_instance}}",
+            self.api.routes["setDisappearingChat"],
             request_body,
         )
 
@@ -136,6 +217,8 @@ class ServiceMethods:
     def __handle_parameters(cls, parameters: dict) -> dict:
         handled_parameters = {}
 
+        if "self" in parameters:
+            del parameters["self"]
         for key, value in parameters.items():
             if value is not None:
                 camel_case_key = cls.__snake_to_camel_case(key)
@@ -149,3 +232,33 @@ class ServiceMethods:
         components = snake_case_str.split('_')
         camel_case_str = components[0] + ''.join(x.title() for x in components[1:])
         return camel_case_str
+
+
+def normalize_phone_number(phone_number: PhoneNumber) -> Optional[int]:
+    """Returns the digits of a phone number or a chat ID as a number."""
+
+    if isinstance(phone_number, int):
+        return phone_number
+
+    digits = NON_DIGITS.sub("", phone_number.partition("@")[0])
+
+    return int(digits) if digits else None
+
+
+async def unique_phone_numbers(
+        phone_numbers: Union[Iterable[PhoneNumber], AsyncIterable[PhoneNumber]]
+) -> AsyncIterator[int]:
+    seen = set()
+
+    if isinstance(phone_numbers, AsyncIterable):
+        async for phone_number in phone_numbers:
+            phone_number = normalize_phone_number(phone_number)
+            if phone_number is not None and phone_number not in seen:
+                seen.add(phone_number)
+                yield phone_number
+    else:
+        for phone_number in phone_numbers:
+            phone_number = normalize_phone_number(phone_number)
+            if phone_number is not None and phone_number not in seen:
+                seen.add(phone_number)
+                yield phone_number
@@ -1,17 +1,108 @@
 import asyncio
 import logging
-from typing import Any, Callable, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Set, TYPE_CHECKING
+
+from ..server import WebhookServer, dispatch
 
 if TYPE_CHECKING:
     from ..API import AsyncGreenApi
+    from .receiving import Receiving
+
+ACK_AFTER_HANDLER = "after_handler"
+ACK_AFTER_SUCCESS = "after_success"
+ACK_ON_RECEIVE = "on_receive"
+
+
+class AckPipeline:
+    """
+    The deletions of received notifications, they are retried on failure.
+    The next notification is received only after the previous one is
+    deleted, so there is at most one deletion in flight, with the
+    on_receive ack mode it runs in the background next to the handler.
+    """
+
+    def __init__(
+            self,
+            receiving: "Receiving",
+            retries: int = 3,
+            retry_delay: float = 0.5
+    ):
+        self.receiving = receiving
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+        # Receipt IDs that were received but not deleted yet, the same
+        # notification may be received again meanwhile.
+        self.pending: Set[int] = set()
+
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+
+    def __contains__(self, receipt_id: int) -> bool:
+        return receipt_id in self.pending
+
+    def add(self, receipt_id: int) -> None:
+        self.pending.add(receipt_id)
+        self._idle.clear()
+
+    def release(self, receipt_id: int) -> None:
+        """Lets a notification that will not be deleted be received again."""
+
+        self.pending.discard(receipt_id)
+        if not self.pending:
+            self._idle.set()
+
+    async def join(self) -> None:
+        """Waits until no notification is pending deletion."""
+
+        await self._idle.wait()
+
+    def ack(self, receipt_id: int) -> None:
+        """Deletes a notification in the background."""
+
+        self._task = asyncio.create_task(self.delete(receipt_id))
+
+    async def delete(self, receipt_id: int) -> bool:
+        """Deletes a notification and returns whether it was deleted."""
+
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    response = await self.receiving.delete_notification(receipt_id)
+                    if response.code == 200:
+                        return True
+                except Exception:
+                    pass
+
+                if attempt < self.retries:
+                    await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+            self.receiving.api.logger.log(
+                logging.ERROR,
+                "Notification %s was not deleted after %s attempts.",
+                receipt_id, self.retries + 1
+            )
+
+            return False
+        finally:
+            self.release(receipt_id)
+
+    async def flush(self) -> None:
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
 
 
 class Webhooks:
     _running: Optional[bool] = None
+    _server: Optional[WebhookServer] = None
 
     def __init__(self, api: "AsyncGreenApi"):
         self.api = api
 
+        # Called with every received notification before the handler.
+        self.notification_hooks: List[Callable[[str, dict], Any]] = []
+
     @property
     def started(self) -> Optional[bool]:
         """Deprecated"""
@@ -29,15 +120,101 @@ class Webhooks:
         self._running = value
 
     async def start_receiving_notifications(
-            self, on_event: Callable[[str, dict], Any]
+            self,
+            on_event: Callable[[str, dict], Any],
+            workers: int = 1,
+            queue_size: Optional[int] = None,
+            ack_mode: str = ACK_AFTER_HANDLER,
+            ack_retries: int = 3,
+            max_attempts: int = 5,
+            retry_delay: float = 1.0
+    ) -> None:
+        """
+        The method starts receiving notifications. With one worker
+        notifications are handled strictly one by one, otherwise received
+        notifications are put in a queue that is handled by a pool of
+        workers. Coroutine handlers are awaited.
+
+        The ack mode sets when a notification is deleted: "after_handler"
+        once the handler has finished, "after_success" only if the
+        handler has not failed, "on_receive" right after it has been
+        received. Failed deletions are retried. Handler errors are logged,
+        with "after_success" the notification is handled again after a
+        delay doubled with every attempt and is deleted after
+        max_attempts failed attempts.
+
+        Green-API returns the first notification of the queue until it is
+        deleted, so a notification is received only after the previous
+        one is deleted, and notifications are received one at a time.
+        Workers help only with "on_receive", where handlers run while the
+        next notifications are received. In the other modes notifications
+        are handled one by one and a warning is logged if more are set.
+        """
+
+        if ack_mode not in (ACK_AFTER_HANDLER, ACK_AFTER_SUCCESS, ACK_ON_RECEIVE):
+            raise ValueError(f"Unknown ack mode: {ack_mode}.")
+
+        if ack_mode != ACK_ON_RECEIVE and workers > 1:
+            self.api.logger.log(
+                logging.WARNING,
+                "Workers are used only with the on_receive ack mode,"
+                " notifications are handled one by one."
+            )
+            workers = 1
+
+        self._running = True
+
+        acks = AckPipeline(self.api.receiving, ack_retries)
+        on_event = self._with_hooks(on_event)
+
+        if workers == 1:
+            await self._start_polling(
+                on_event, acks, ack_mode, max_attempts, retry_delay
+            )
+        else:
+            await self._start_consuming(
+                on_event, acks, workers, queue_size or workers * 2
+            )
+
+    async def start_webhook_server(
+            self,
+            on_event: Callable[[str, dict], Any],
+            host: str = "0.0.0.0",
+            port: int = 8080,
+            path: str = "/",
+            workers: int = 1,
+            queue_size: Optional[int] = None,
+            token: Optional[str] = None
     ) -> None:
+        """
+        The method starts an HTTP server that receives notifications sent
+        by Green-API to the webhook URL of the instance. The token is
+        compared with the Authorization header of the requests.
+        """
+
         self._running = True
 
-        await self._start_polling(on_event)
+        self._server = WebhookServer(
+            self._with_hooks(on_event),
+            host,
+            port,
+            path,
+            workers,
+            queue_size,
+            token,
+            logger=self.api.logger
+        )
+        try:
+            await self._server.serve_forever()
+        finally:
+            self._server = None
 
     def stop_receiving_notifications(self) -> None:
         self._running = False
 
+        if self._server is not None:
+            self._server.close()
+
     async def job(self, on_event: Callable[[str, dict], Any]) -> None:
         """Deprecated"""
 
@@ -69,34 +246,153 @@ class Webhooks:
 
         print("Stopped receiving incoming notifications.")
 
-    async def _start_polling(self, handler: Callable[[str, dict], Any]) -> None:
-        self.api.session.headers["Connection"] = "keep-alive"
+    def _with_hooks(
+            self, handler: Callable[[str, dict], Any]
+    ) -> Callable[[str, dict], Any]:
+        async def handle(type_webhook: str, body: dict) -> None:
+            for hook in self.notification_hooks:
+                try:
+                    await dispatch(hook, type_webhook, body)
+                except Exception:
+                    self.api.logger.exception(
+                        "Notification hook was failed with error."
+                    )
+
+            await dispatch(handler, type_webhook, body)
+
+        return handle
+
+    async def _start_polling(
+            self,
+            handler: Callable[[str, dict], Any],
+            acks: AckPipeline,
+            ack_mode: str,
+            max_attempts: int,
+            retry_delay: float
+    ) -> None:
+        # Failed attempts to handle notifications by receipt ID.
+        failures: Dict[int, int] = {}
 
         self.api.logger.log(
             logging.INFO, "Started receiving incoming notifications."
         )
 
-        while self._running:
-            try:
-                response = await self.api.receiving.receive_notification()
-                if response.code == 200:
-                    if not response.data:
+        try:
+            while self._running:
+                try:
+                    notification = await self._receive_one(acks, ack_mode)
+                    if notification is None:
                         continue
-                    response = response.data
 
-                    body = response["body"]
-                    type_webhook = body["typeWebhook"]
+                    body = notification["body"]
+                    receipt_id = notification["receiptId"]
 
-                    handler(type_webhook, body)
+                    try:
+                        await dispatch(handler, body["typeWebhook"], body)
+                    except Exception:
+                        self.api.logger.exception(
+                            "Notification handler was failed with error."
+                        )
 
-                    await self.api.receiving.delete_notification(
-                        response["receiptId"]
-                    )
-            except KeyboardInterrupt:
-                break
+                        if ack_mode == ACK_AFTER_SUCCESS:
+                            attempts = failures[receipt_id] = failures.get(receipt_id, 0) + 1
+                            if attempts < max_attempts:
+                                # The notification is received again.
+                                await asyncio.sleep(retry_delay * 2 ** (attempts - 1))
+                                acks.release(receipt_id)
+                                continue
 
-        self.api.session.headers["Connection"] = "close"
+                            self.api.logger.log(
+                                logging.ERROR,
+                                "Notification %s is deleted after %s failed attempts.",
+                                receipt_id, attempts
+                            )
+                    failures.pop(receipt_id, None)
+
+                    # The next notification is returned only after the
+                    # deletion, so it is not run in the background.
+                    if ack_mode != ACK_ON_RECEIVE:
+                        await acks.delete(receipt_id)
+                except KeyboardInterrupt:
+                    break
+        finally:
+            await acks.flush()
 
         self.api.logger.log(
             logging.INFO, "Stopped receiving incoming notifications."
         )
+
+    async def _start_consuming(
+            self,
+            handler: Callable[[str, dict], Any],
+            acks: AckPipeline,
+            workers: int,
+            queue_size: int
+    ) -> None:
+        queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+        self.api.logger.log(
+            logging.INFO, "Started receiving incoming notifications."
+        )
+
+        worker_tasks = [
+            asyncio.create_task(self._work(handler, queue))
+            for _ in range(workers)
+        ]
+
+        try:
+            await self._receive(queue, acks)
+
+            await queue.join()
+        finally:
+            for task in worker_tasks:
+                task.cancel()
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+
+            await acks.flush()
+
+        self.api.logger.log(
+            logging.INFO, "Stopped receiving incoming notifications."
+        )
+
+    async def _receive(self, queue: asyncio.Queue, acks: AckPipeline) -> None:
+        while self._running:
+            notification = await self._receive_one(acks, ACK_ON_RECEIVE)
+            if notification is not None:
+                await queue.put(notification)
+
+    async def _receive_one(
+            self, acks: AckPipeline, ack_mode: str
+    ) -> Optional[dict]:
+        # The notification is returned until it is deleted, there is
+        # nothing else to receive meanwhile.
+        await acks.join()
+
+        response = await self.api.receiving.receive_notification()
+        if response.code != 200 or not response.data:
+            return None
+        notification = response.data
+
+        receipt_id = notification["receiptId"]
+        acks.add(receipt_id)
+
+        if ack_mode == ACK_ON_RECEIVE:
+            acks.ack(receipt_id)
+
+        return notification
+
+    async def _work(
+            self, handler: Callable[[str, dict], Any], queue: asyncio.Queue
+    ) -> None:
+        while True:
+            notification = await queue.get()
+            try:
+                body = notification["body"]
+
+                await dispatch(handler, body["typeWebhook"], body)
+            except Exception:
+                self.api.logger.exception(
+                    "Notification handler was failed with error."
+                )
+            finally:
+                queue.task_done()
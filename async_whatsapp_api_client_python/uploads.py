@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import pathlib
+from typing import (
+    Any, AsyncIterable, AsyncIterator, BinaryIO, Dict, Optional, Tuple, Union
+)
+
+from .cache import CacheBackend, MemoryCache
+
+File = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, AsyncIterable[bytes]]
+
+CHUNK_SIZE = 256 * 1024
+
+
+class Upload:
+    """
+    The file to upload. Paths are opened and read in a worker thread
+    chunk by chunk and closed once the body is sent, file objects are
+    read the same way but are left open, bytes and async iterables of
+    bytes are sent as they are.
+    """
+
+    def __init__(
+            self,
+            file: File,
+            file_name: Optional[str] = None,
+            content_type: Optional[str] = None,
+            chunk_size: int = CHUNK_SIZE
+    ):
+        self.file = file
+        self.chunk_size = chunk_size
+
+        if file_name is None:
+            if isinstance(file, (str, os.PathLike)):
+                file_name = pathlib.Path(file).name
+            else:
+                name = getattr(file, "name", None)
+                file_name = pathlib.Path(name).name if isinstance(name, str) else "file"
+        self.file_name = file_name
+
+        if content_type is None:
+            content_type = mimetypes.guess_type(file_name)[0]
+        self.content_type = content_type or "application/octet-stream"
+
+    async def size(self) -> Optional[int]:
+        if isinstance(self.file, (str, os.PathLike)):
+            return (await asyncio.to_thread(os.stat, self.file)).st_size
+        if isinstance(self.file, (bytes, bytearray, memoryview)):
+            return len(self.file)
+        if not isinstance(self.file, AsyncIterable) and self.file.seekable():
+            position = self.file.tell()
+            size = self.file.seek(0, os.SEEK_END) - position
+            self.file.seek(position)
+            return size
+
+        return None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        file = self.file
+
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            view = memoryview(file)
+            for start in range(0, len(view), self.chunk_size):
+                yield bytes(view[start:start + self.chunk_size])
+        elif isinstance(file, (str, os.PathLike)):
+            handle = await asyncio.to_thread(open, file, "rb")
+            try:
+                async for chunk in self.__read(handle):
+                    yield chunk
+            finally:
+                handle.close()
+        elif isinstance(file, AsyncIterable):
+            async for chunk in file:
+                yield chunk
+        else:
+            async for chunk in self.__read(file):
+                yield chunk
+
+    async def __read(self, handle: BinaryIO) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await asyncio.to_thread(handle.read, self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+async def encode_multipart(
+        fields: Dict[str, Any], name: str, upload: Upload
+) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    """
+    Encodes form fields and a file as a streamed multipart/form-data
+    body. Returns the headers of the request and the body.
+    """
+
+    boundary = os.urandom(16).hex()
+
+    parts = []
+    for key, value in fields.items():
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        parts.append(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{key}"\r\n\r\n'
+            f"{value}\r\n"
+        )
+    file_name = upload.file_name.replace('"', "%22")
+    parts.append(
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{name}"; filename="{file_name}"\r\n'
+        f"Content-Type: {upload.content_type}\r\n\r\n"
+    )
+
+    head = "".join(parts).encode("UTF-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("UTF-8")
+
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+    size = await upload.size()
+    if size is not None:
+        headers["Content-Length"] = str(len(head) + size + len(tail))
+
+    async def stream() -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in upload:
+            yield chunk
+        yield tail
+
+    return headers, stream()
+
+
+class UploadCache:
+    """
+    The cache of URLs of uploaded files keyed by the SHA-256 hash of
+    their content. Hashes of files at paths are cached by the path, size
+    and modification time, so unchanged files are not hashed again.
+    File objects and async iterables are not cached.
+    """
+
+    def __init__(
+            self,
+            backend: Optional[CacheBackend] = None,
+            ttl: Optional[float] = 24 * 60 * 60
+    ):
+        self.backend = backend or MemoryCache()
+        self.ttl = ttl
+
+    async def key(self, file: File) -> Optional[str]:
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            digest = await asyncio.to_thread(hash_bytes, file)
+
+            return f"upload:{digest}"
+        if not isinstance(file, (str, os.PathLike)):
+            return None
+
+        path = os.path.abspath(file)
+        stat = await asyncio.to_thread(os.stat, path)
+        stat_key = f"upload-stat:{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+        digest = await self.backend.get(stat_key)
+        if digest is None:
+            digest = await asyncio.to_thread(hash_path, path)
+            await self.backend.set(stat_key, digest, self.ttl)
+
+        return f"upload:{digest}"
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.backend.get(key)
+
+    async def set(self, key: str, url_file: str) -> None:
+        await self.backend.set(key, url_file, self.ttl)
+
+
+def hash_bytes(data: Union[bytes, bytearray, memoryview]) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_path(path: Union[str, os.PathLike]) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
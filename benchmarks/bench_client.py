@@ -0,0 +1,256 @@
+"""
+Measures the client against the local stand-in for Green-API: message
+send throughput directly and through the outbox, upload bandwidth,
+response parsing cost and memory per instance. Results are printed as JSON.
+
+    python -m benchmarks.bench_client --count 2000 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import tempfile
+import time
+import timeit
+import tracemalloc
+from typing import Dict, List
+
+from async_whatsapp_api_client_python import AsyncGreenAPI, InstancePool
+from async_whatsapp_api_client_python.metrics import Instrument, RequestMetrics
+from async_whatsapp_api_client_python.response import Response, loads
+
+from .fake_server import FakeGreenApi
+
+
+class Latencies(Instrument):
+    def __init__(self):
+        self.values: List[float] = []
+
+    def finished(self, metrics: RequestMetrics) -> None:
+        self.values.append(metrics.elapsed)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def bench_send(
+        count: int,
+        latency: float,
+        concurrency: int,
+        payload_size: int = 0,
+        error_rate: float = 0.0
+) -> Dict:
+    latencies = Latencies()
+
+    async with FakeGreenApi(
+            latency, error_rate, payload_size, error_status=503
+    ) as server:
+        api = AsyncGreenAPI(
+            "1101000001", "token", host=server.url, instruments=[latencies]
+        )
+        api.logger.disabled = True
+
+        messages = (
+            {"chat_id": "79001234567@c.us", "message": "Hello"}
+            for _ in range(count)
+        )
+
+        failed = 0
+        started = time.perf_counter()
+        async for _, response in api.sending.send_many(
+                messages, concurrency, backoff=0.01
+        ):
+            if response.code != 200:
+                failed += 1
+        elapsed = time.perf_counter() - started
+
+        api.logger.disabled = False
+        await api.close()
+
+    return {
+        "name": f"send[concurrency={concurrency},error_rate={error_rate}]",
+        "count": count,
+        "failed": failed,
+        "throughput": count / elapsed,
+        "request_mean": statistics.fmean(latencies.values),
+        "request_p50": percentile(latencies.values, 0.5),
+        "request_p99": percentile(latencies.values, 0.99)
+    }
+
+
+async def bench_outbox(count: int, latency: float, concurrency: int) -> Dict:
+    async with FakeGreenApi(latency) as server:
+        api = AsyncGreenAPI("1101000001", "token", host=server.url)
+
+        with tempfile.TemporaryDirectory() as directory:
+            async with api.sending.outbox(os.path.join(directory, "outbox.sqlite3")) as outbox:
+                started = time.perf_counter()
+                outbox.start(concurrency)
+                await asyncio.gather(*(
+                    outbox.put({"chat_id": "79001234567@c.us", "message": "Hello"})
+                    for _ in range(count)
+                ))
+                while (await outbox.counts())["sent"] < count:
+                    await asyncio.sleep(0.01)
+                elapsed = time.perf_counter() - started
+
+        await api.close()
+
+    return {
+        "name": f"outbox[concurrency={concurrency}]",
+        "count": count,
+        "throughput": count / elapsed
+    }
+
+
+async def bench_upload(size: int, count: int, concurrency: int) -> Dict:
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as file:
+        file.write(os.urandom(size))
+    try:
+        async with FakeGreenApi() as server:
+            api = AsyncGreenAPI(
+                "1101000001", "token", host=server.url, media=server.url,
+                write_timeout=60
+            )
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def upload() -> None:
+                async with semaphore:
+                    response = await api.sending.upload_file(file.name)
+                    assert response.code == 200, response.text
+
+            started = time.perf_counter()
+            await asyncio.gather(*(upload() for _ in range(count)))
+            elapsed = time.perf_counter() - started
+
+            await api.close()
+    finally:
+        os.remove(file.name)
+
+    return {
+        "name": f"upload[size={size},concurrency={concurrency}]",
+        "count": count,
+        "bandwidth": size * count / elapsed / 1024 ** 2
+    }
+
+
+def bench_parse(messages: int, repeat: int) -> Dict:
+    content = json.dumps([
+        {
+            "type": "incoming",
+            "idMessage": f"BAE5F4886F6F2D{index:06}",
+            "timestamp": 1587129319,
+            "typeMessage": "textMessage",
+            "chatId": "79001234567@c.us",
+            "senderId": "79001234567@c.us",
+            "senderName": "Green API",
+            "textMessage": "Hello, this is a message of the chat history"
+        }
+        for index in range(messages)
+    ]).encode()
+
+    elapsed = min(timeit.repeat(
+        lambda: Response(200, content).data, number=repeat, repeat=3
+    )) / repeat
+
+    return {
+        "name": f"parse[messages={messages}]",
+        "decoder": loads.__module__,
+        "size": len(content),
+        "parse_time": elapsed,
+        "parse_bandwidth": len(content) / elapsed / 1024 ** 2
+    }
+
+
+def bench_memory(instances: int, pooled: bool) -> Dict:
+    async def create() -> int:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+
+        clients = []
+        pool = None
+        if pooled:
+            pool = InstancePool({str(index): "token" for index in range(instances)})
+            for index in range(instances):
+                client = pool.get(str(index))
+                client.routes["sendMessage"]
+                client.sending
+        else:
+            for index in range(instances):
+                client = AsyncGreenAPI(str(index), "token")
+                client.routes["sendMessage"]
+                client.sending
+                clients.append(client)
+
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        if pool is not None:
+            await pool.close()
+        for client in clients:
+            await client.close()
+
+        return used
+
+    used = asyncio.run(create())
+
+    return {
+        "name": f"memory[instances={instances},pooled={pooled}]",
+        "memory_per_instance": used / instances
+    }
+
+
+async def main(arguments: argparse.Namespace) -> List[Dict]:
+    results = [
+        await bench_send(arguments.count, arguments.latency, 1),
+        await bench_send(arguments.count, arguments.latency, arguments.concurrency),
+        await bench_send(
+            arguments.count, arguments.latency, arguments.concurrency,
+            error_rate=arguments.error_rate
+        ),
+        await bench_outbox(arguments.count, arguments.latency, arguments.concurrency),
+        await bench_upload(
+            arguments.upload_size, arguments.upload_count, arguments.concurrency
+        )
+    ]
+
+    return results
+
+
+def run(arguments: argparse.Namespace) -> List[Dict]:
+    results = asyncio.run(main(arguments))
+    results += [
+        bench_parse(messages, max(1, 10000 // messages))
+        for messages in (1, 100, 1000)
+    ]
+    results += [
+        bench_memory(arguments.instances, pooled=True),
+        bench_memory(max(1, arguments.instances // 10), pooled=False)
+    ]
+
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--upload-size", type=int, default=8 * 1024 ** 2)
+    parser.add_argument("--upload-count", type=int, default=8)
+    parser.add_argument("--instances", type=int, default=1000)
+
+
+if __name__ == '__main__':
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    add_arguments(argument_parser)
+
+    print(json.dumps(run(argument_parser.parse_args()), indent=4))
@@ -0,0 +1,203 @@
+"""
+Compares receiving notifications by polling receiveNotification with
+the webhook server. Both receive the same burst of notifications from a
+local sender, results are printed as JSON.
+
+    python -m benchmarks.bench_webhooks --count 2000 --latency 0.005 --handler-time 0.02
+
+Green-API returns the first notification of the queue until it is
+deleted, so a notification is received only after the previous one is
+deleted. plain_polling is the loop of receive, handle and delete that
+start_receiving_notifications is measured against, workers help only
+with the on_receive ack mode.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from async_whatsapp_api_client_python import AsyncGreenAPI
+from async_whatsapp_api_client_python.server import WebhookServer
+
+from .fake_server import FakeGreenApi
+
+
+async def handle(handler_time: float) -> None:
+    if handler_time:
+        await asyncio.sleep(handler_time)
+
+
+def summarize(name: str, latencies: List[float], elapsed: float) -> Dict:
+    latencies.sort()
+
+    return {
+        "name": name,
+        "count": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "latency_mean": statistics.fmean(latencies),
+        "latency_p50": latencies[len(latencies) // 2],
+        "latency_p99": latencies[int(len(latencies) * 0.99)]
+    }
+
+
+async def bench_plain_polling(count: int, latency: float, handler_time: float) -> Dict:
+    latencies: List[float] = []
+
+    async with FakeGreenApi(latency) as server:
+        api = AsyncGreenAPI("1101000001", "token", host=server.url)
+
+        started = time.perf_counter()
+        for _ in range(count):
+            server.push_notification({
+                "typeWebhook": "incomingMessageReceived",
+                "sentAt": time.perf_counter()
+            })
+
+        while len(latencies) < count:
+            response = await api.receiving.receive_notification()
+            if not response.data:
+                continue
+
+            await handle(handler_time)
+            latencies.append(time.perf_counter() - response.data["body"]["sentAt"])
+
+            await api.receiving.delete_notification(response.data["receiptId"])
+        elapsed = time.perf_counter() - started
+
+        await api.close()
+        requests = server.requests
+
+    return {**summarize("plain_polling", latencies, elapsed), "requests": requests}
+
+
+async def bench_polling(
+        count: int,
+        latency: float,
+        workers: int,
+        ack_mode: str,
+        redelivery_timeout: Optional[float] = None,
+        handler_time: float = 0.0
+) -> Dict:
+    latencies: List[float] = []
+
+    async with FakeGreenApi(
+            latency, redelivery_timeout=redelivery_timeout
+    ) as server:
+        api = AsyncGreenAPI("1101000001", "token", host=server.url)
+
+        async def handler(type_webhook: str, body: dict) -> None:
+            await handle(handler_time)
+            latencies.append(time.perf_counter() - body["sentAt"])
+            if len(latencies) == count:
+                api.webhooks.stop_receiving_notifications()
+
+        started = time.perf_counter()
+        for _ in range(count):
+            server.push_notification({
+                "typeWebhook": "incomingMessageReceived",
+                "sentAt": time.perf_counter()
+            })
+
+        await api.webhooks.start_receiving_notifications(
+            handler, workers, ack_mode=ack_mode
+        )
+        elapsed = time.perf_counter() - started
+
+        await api.close()
+        requests = server.requests
+
+    return {**summarize(
+        f"polling[workers={workers},ack={ack_mode}]",
+        latencies,
+        elapsed
+    ), "requests": requests}
+
+
+async def bench_webhook_server(
+        count: int, latency: float, senders: int, workers: int
+) -> Dict:
+    latencies: List[float] = []
+
+    server = WebhookServer(
+        lambda type_webhook, body: latencies.append(
+            time.perf_counter() - body["sentAt"]
+        ),
+        "127.0.0.1",
+        0,
+        workers=workers
+    )
+    await server.start()
+
+    remaining = iter(range(count))
+
+    async def send(client: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            body = {
+                "typeWebhook": "incomingMessageReceived",
+                "sentAt": time.perf_counter()
+            }
+            if latency:
+                await asyncio.sleep(latency)
+            await client.post("/", json=body)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+        await asyncio.gather(*(send(client) for _ in range(senders)))
+    await server.stop()
+    elapsed = time.perf_counter() - started
+
+    return summarize(
+        f"webhook_server[senders={senders},workers={workers}]",
+        latencies,
+        elapsed
+    )
+
+
+async def main(arguments: argparse.Namespace) -> List[Dict]:
+    handler_time = arguments.handler_time
+
+    return [
+        await bench_plain_polling(arguments.count, arguments.latency, handler_time),
+        await bench_polling(
+            arguments.count, arguments.latency, 1, "after_handler",
+            handler_time=handler_time
+        ),
+        await bench_polling(
+            arguments.count, arguments.latency, 1, "on_receive",
+            handler_time=handler_time
+        ),
+        await bench_polling(
+            arguments.count, arguments.latency, arguments.concurrency,
+            "on_receive", arguments.redelivery_timeout, handler_time
+        ),
+        await bench_webhook_server(
+            arguments.count, arguments.latency, arguments.concurrency,
+            arguments.concurrency
+        )
+    ]
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--handler-time", type=float, default=0.0,
+        help="the time the notification handler takes"
+    )
+    parser.add_argument(
+        "--redelivery-timeout", type=float, default=None,
+        help="hide received notifications from other receives for this long"
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    print(json.dumps(asyncio.run(main(parse_arguments())), indent=4))
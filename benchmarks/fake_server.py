@@ -0,0 +1,164 @@
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from async_whatsapp_api_client_python.server import read_request, write_response
+
+
+class FakeGreenApi:
+    """
+    The local stand-in for Green-API. Every reply is delayed by the
+    latency and fails with the error rate and status, methods that are
+    not emulated return a generic payload of the configured size.
+
+    By default the first notification of the queue is returned until it
+    is deleted. With a redelivery timeout a received notification is
+    hidden from other receives until it is deleted or the timeout ends.
+    """
+
+    def __init__(
+            self,
+            latency: float = 0.0,
+            error_rate: float = 0.0,
+            payload_size: int = 0,
+            receive_timeout: float = 0.05,
+            redelivery_timeout: Optional[float] = None,
+            error_status: int = 500
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.payload_size = payload_size
+        self.receive_timeout = receive_timeout
+        self.redelivery_timeout = redelivery_timeout
+        self.error_status = error_status
+
+        self.notifications: Deque[dict] = deque()
+        self.hidden: Dict[int, float] = {}
+        self.requests = 0
+        self.received_bytes = 0
+
+        self._receipt_id = 0
+        self._available = asyncio.Event()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    @property
+    def url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+
+        return f"http://127.0.0.1:{port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        connections = list(self._writers.items())
+        for writer, _ in connections:
+            writer.close()
+        await asyncio.gather(
+            *(task for _, task in connections), return_exceptions=True
+        )
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "FakeGreenApi":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def push_notification(self, body: dict) -> None:
+        self._receipt_id += 1
+        self.notifications.append({"receiptId": self._receipt_id, "body": body})
+        self._available.set()
+
+    async def _serve(
+            self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers[writer] = asyncio.current_task()
+        try:
+            while True:
+                request = await read_request(reader, 1024 ** 3)
+                if request is None:
+                    break
+                method, target, _, body = request
+
+                self.requests += 1
+                self.received_bytes += len(body)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                status, content = await self._route(method, target, body)
+
+                write_response(writer, status, content)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.pop(writer, None)
+            writer.close()
+
+    async def _route(
+            self, method: str, target: str, body: bytes
+    ) -> Tuple[int, bytes]:
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error_status, b'{"message": "Internal Server Error"}'
+
+        # /waInstance{id_instance}/{method}/{api_token_instance}[/{argument}]
+        parts = target.partition("?")[0].split("/")
+        api_method = parts[2] if len(parts) > 2 else ""
+
+        if api_method == "receiveNotification":
+            return 200, await self._receive_notification()
+        if api_method == "deleteNotification":
+            self._delete_notification(int(parts[4]))
+            return 200, b'{"result": true}'
+        if api_method == "uploadFile":
+            return 200, b'{"urlFile": "https://sw-media-out.storage1.ru/1101000001/file"}'
+
+        return 200, json.dumps({
+            "idMessage": "BAE5F4886F6F2D05",
+            "payload": "x" * self.payload_size
+        }).encode()
+
+    async def _receive_notification(self) -> bytes:
+        deadline = time.monotonic() + self.receive_timeout
+
+        while True:
+            notification = self._next_notification()
+            if notification is not None:
+                return json.dumps(notification).encode()
+
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return b"null"
+
+            self._available.clear()
+            try:
+                await asyncio.wait_for(self._available.wait(), timeout)
+            except asyncio.TimeoutError:
+                return b"null"
+
+    def _next_notification(self) -> Optional[dict]:
+        if self.redelivery_timeout is None:
+            return self.notifications[0] if self.notifications else None
+
+        now = time.monotonic()
+        for notification in self.notifications:
+            receipt_id = notification["receiptId"]
+            if self.hidden.get(receipt_id, 0.0) <= now:
+                self.hidden[receipt_id] = now + self.redelivery_timeout
+                return notification
+
+        return None
+
+    def _delete_notification(self, receipt_id: int) -> None:
+        self.hidden.pop(receipt_id, None)
+        for notification in self.notifications:
+            if notification["receiptId"] == receipt_id:
+                self.notifications.remove(notification)
+                break
@@ -0,0 +1,111 @@
+"""
+Runs all benchmarks against the local stand-in for Green-API and writes
+the results as JSON. With a baseline, results of a previous run, the
+main metric of every benchmark is compared with it and the exit status
+is 1 if any of them is worse by more than the threshold.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+from typing import Dict, List
+
+import httpx
+
+from . import bench_client, bench_webhooks
+
+# The main metric of a benchmark and whether higher values are better.
+MAIN_METRICS = {
+    "throughput": True,
+    "bandwidth": True,
+    "parse_time": False,
+    "memory_per_instance": False
+}
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    previous = {result["name"]: result for result in baseline}
+
+    regressions = []
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+
+        for metric, higher_is_better in MAIN_METRICS.items():
+            if metric not in result or not old.get(metric):
+                continue
+
+            change = (result[metric] - old[metric]) / old[metric]
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append({
+                    "name": result["name"],
+                    "metric": metric,
+                    "baseline": old[metric],
+                    "value": result[metric],
+                    "change": change
+                })
+            break
+
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    bench_client.add_arguments(parser)
+    parser.add_argument("--redelivery-timeout", type=float, default=None)
+    parser.add_argument("--handler-time", type=float, default=0.0)
+    parser.add_argument("--output", help="the file to write the results to")
+    parser.add_argument("--baseline", help="the results of a previous run")
+    parser.add_argument("--threshold", type=float, default=0.2)
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    arguments = parse_arguments()
+
+    results = bench_client.run(arguments)
+    results += asyncio.run(bench_webhooks.main(arguments))
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "httpx": httpx.__version__
+        },
+        "arguments": vars(arguments),
+        "results": results
+    }
+
+    status = 0
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="UTF-8") as file:
+            baseline = json.load(file)
+
+        report["regressions"] = compare(
+            results, baseline["results"], arguments.threshold
+        )
+        if report["regressions"]:
+            status = 1
+
+    text = json.dumps(report, indent=4)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="UTF-8") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import asyncio
+
+from async_whatsapp_api_client_python import AsyncGreenAPI, Dispatcher
+
+dispatcher = Dispatcher()
+
+
+@dispatcher.on("incomingMessageReceived", "textMessage")
+async def incoming_text_message(body: dict) -> None:
+    sender = body["senderData"]["chatId"]
+    text = body["messageData"]["textMessageData"]["textMessage"]
+
+    print(f"New text message from {sender}: {text}")
+
+
+@dispatcher.on("incomingMessageReceived", "imageMessage")
+def incoming_image_message(body: dict) -> None:
+    print(f"New image from {body['senderData']['chatId']}")
+
+
+@dispatcher.on("stateInstanceChanged")
+def state_instance_changed(body: dict) -> None:
+    print(f"Current instance state: {body['stateInstance']}")
+
+
+async def main():
+    async_green_api = AsyncGreenAPI(
+        "YOUR_ID_INSTANCE", "YOUR_API_TOKEN_INSTANCE"
+    )
+
+    await async_green_api.webhooks.start_receiving_notifications(dispatcher)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -15,7 +15,7 @@ setup(
     author="Dark04072006",
     author_email="Abrekovalim38702@gmail.com",
     url="https://github.com/Dark04072006/async-whatsapp-api-client-python",
-    packages=find_packages(exclude=["tests"]),
+    packages=find_packages(exclude=["tests", "benchmarks"]),
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Environment :: Console",
@@ -43,5 +43,10 @@ setup(
     install_requires=[
         "httpx==0.26.0"
     ],
+    extras_require={
+        "http2": ["httpx[http2]==0.26.0"],
+        "speedups": ["orjson"],
+        "opentelemetry": ["opentelemetry-api"]
+    },
     python_requires=">=3.10"
 )
@@ -0,0 +1,90 @@
+import logging
+import unittest
+from unittest.mock import Mock, patch
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI, LoggedBody
+from async_whatsapp_api_client_python.response import Response
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/getStateInstance/token"):
+        return httpx.Response(401)
+
+    return httpx.Response(200, json={"stateInstance": "authorized"})
+
+
+class LoggingTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.api = AsyncGreenAPI(
+            "1101000001", "token", debug_mode=True,
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        self.addCleanup(self.api.logger.setLevel, logging.INFO)
+
+    async def test_lazy_formatting(self):
+        self.api.logger.setLevel(logging.INFO)
+
+        with patch.object(LoggedBody, "__str__", Mock(return_value="")) as format_body:
+            response = await self.api.account.get_settings()
+
+            self.assertEqual(response.code, 200)
+            format_body.assert_not_called()
+
+        with self.assertLogs("whatsapp-api-client-python", "DEBUG") as logs:
+            await self.api.account.get_settings()
+
+        self.assertIn('"stateInstance": "authorized"', logs.output[0])
+
+    async def test_unauthorized(self):
+        with self.assertLogs("whatsapp-api-client-python", "ERROR") as logs:
+            response = await self.api.account.get_state_instance()
+
+        self.assertEqual(response.code, 401)
+        self.assertEqual(logs.records[0].getMessage(), "Request was failed with status code: 401. Data: Unauthorized")
+
+    def test_truncation(self):
+        body = LoggedBody(Response(500, b'{"message": "' + b"x" * 100 + b'"}'), 20)
+
+        self.assertEqual(str(body), '{"message": "xxxxxxx... (95 more bytes)')
+        self.assertEqual(str(LoggedBody(Response(500, b'{"message": "Error"}'), None)), '{\n    "message": "Error"\n}')
+
+
+class SessionTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_options(self):
+        with patch("async_whatsapp_api_client_python.API.AsyncClient") as client:
+            AsyncGreenAPI(
+                "1101000001", "token",
+                http2=True,
+                max_connections=10,
+                max_keepalive_connections=5,
+                keepalive_expiry=30,
+                connect_timeout=1,
+                read_timeout=60,
+                write_timeout=None,
+                pool_timeout=2
+            )
+
+        client.assert_called_once_with(
+            http2=True,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=30),
+            timeout=httpx.Timeout(connect=1, read=60, write=None, pool=2)
+        )
+
+    async def test_close(self):
+        api = AsyncGreenAPI("1101000001", "token")
+        await api.close()
+
+        self.assertTrue(api.session.is_closed)
+
+        session = httpx.AsyncClient()
+        self.addAsyncCleanup(session.aclose)
+        async with AsyncGreenAPI("1101000001", "token", session=session) as api:
+            self.assertIs(api.session, session)
+
+        self.assertFalse(session.is_closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from collections import Counter
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+from async_whatsapp_api_client_python.breaker import (
+    CLOSED, CircuitBreaker, HALF_OPEN, OPEN, StateChange
+)
+
+
+class CircuitBreakerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = Counter()
+        self.status_code = 503
+        self.state_instance = "notAuthorized"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            self.calls[method] += 1
+
+            if method == "getStateInstance":
+                return httpx.Response(200, json={"stateInstance": self.state_instance})
+
+            return httpx.Response(self.status_code, json={"idMessage": "BAE5F4886F6F2D05"})
+
+        self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0)
+        self.changes = []
+        self.breaker.hooks.append(self.changes.append)
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            circuit_breaker=self.breaker
+        )
+
+    async def test_circuit_breaker(self):
+        self.breaker.recovery_timeout = 60
+
+        for _ in range(3):
+            await self.api.sending.send_message("", "")
+
+        response = await self.api.sending.send_message("", "")
+        self.assertIsNone(response.code)
+        self.assertEqual(self.calls["sendMessage"], 2)
+        self.assertEqual(self.breaker.state("1101000001", "sendMessage"), OPEN)
+        self.assertEqual(self.breaker.state("1101000001", "sendPoll"), CLOSED)
+        self.assertEqual(self.breaker.open_methods("1101000001"), ["sendMessage"])
+
+    async def test_recovery(self):
+        for _ in range(2):
+            await self.api.sending.send_message("", "")
+
+        # The instance is not authorized, so the probe fails.
+        self.assertIsNone((await self.api.sending.send_message("", "")).code)
+        self.assertEqual(self.calls["sendMessage"], 2)
+
+        self.state_instance = "authorized"
+        self.status_code = 200
+        self.assertEqual((await self.api.sending.send_message("", "")).code, 200)
+        self.assertEqual(self.breaker.state("1101000001", "sendMessage"), CLOSED)
+
+        self.assertEqual(self.calls["getStateInstance"], 2)
+        self.assertEqual(self.changes, [
+            StateChange("1101000001", "sendMessage", CLOSED, OPEN),
+            StateChange("1101000001", "sendMessage", OPEN, HALF_OPEN),
+            StateChange("1101000001", "sendMessage", HALF_OPEN, OPEN),
+            StateChange("1101000001", "sendMessage", OPEN, HALF_OPEN),
+            StateChange("1101000001", "sendMessage", HALF_OPEN, CLOSED)
+        ])
+
+    async def test_failed_trial(self):
+        for _ in range(2):
+            await self.api.sending.send_message("", "")
+
+        self.state_instance = "authorized"
+        self.assertEqual((await self.api.sending.send_message("", "")).code, 503)
+        self.assertEqual(self.breaker.state("1101000001", "sendMessage"), OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
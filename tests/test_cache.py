@@ -0,0 +1,77 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+from async_whatsapp_api_client_python import (
+    AsyncGreenAPI, MemoryCache, SQLiteCache, UploadCache
+)
+
+BASE_DIR = Path(__file__).parent.parent
+
+path = BASE_DIR / "examples/data/rates.png"
+
+
+class CacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_memory_cache(self):
+        cache = MemoryCache(max_size=2)
+
+        await cache.set("first", 1)
+        await cache.set("second", 2)
+        await cache.get("first")
+        await cache.set("third", 3, ttl=0.01)
+
+        self.assertIsNone(await cache.get("second"))
+        self.assertEqual(await cache.get("first"), 1)
+        self.assertEqual(await cache.get("third"), 3)
+
+        await asyncio.sleep(0.02)
+
+        self.assertIsNone(await cache.get("third"))
+
+    async def test_sqlite_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SQLiteCache(Path(directory) / "cache.db")
+
+            await cache.set("key", {"urlFile": "https://example.com"})
+            await cache.set("expired", 1, ttl=-1)
+
+            self.assertEqual(await cache.get("key"), {"urlFile": "https://example.com"})
+            self.assertIsNone(await cache.get("expired"))
+
+            await cache.delete("key")
+
+            self.assertIsNone(await cache.get("key"))
+
+            cache.close()
+
+    async def test_upload_cache(self):
+        methods = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            methods.append(method)
+
+            return httpx.Response(200, json={
+                "idMessage": "BAE5F4886F6F2D05",
+                "urlFile": "https://sw-media-out.storage.example/rates.png"
+            })
+
+        api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            upload_cache=UploadCache()
+        )
+
+        for _ in range(3):
+            await api.sending.send_file_by_upload("11001234567@c.us", path)
+        response = await api.sending.upload_file(path.read_bytes())
+
+        self.assertEqual(methods, ["sendFileByUpload", "sendFileByUrl", "sendFileByUrl"])
+        self.assertEqual(response.data["urlFile"], "https://sw-media-out.storage.example/rates.png")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from collections import Counter
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+
+
+class CoalescingTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = Counter()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            self.calls[method] += 1
+            await asyncio.sleep(0.01)
+
+            return httpx.Response(200, json={"stateInstance": "authorized"})
+
+        self.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.api = AsyncGreenAPI("1101000001", "token", session=self.session)
+
+    async def test_coalescing(self):
+        responses = await asyncio.gather(*(
+            self.api.account.get_state_instance() for _ in range(10)
+        ))
+        self.assertEqual(self.calls["getStateInstance"], 1)
+        self.assertEqual(len({id(response) for response in responses}), 1)
+        self.assertEqual(self.api.coalesced, {"getStateInstance": 9})
+
+        await asyncio.gather(
+            self.api.groups.get_group_data("120363025955348359@g.us"),
+            self.api.groups.get_group_data("120363025955348359@g.us"),
+            self.api.groups.get_group_data("120363025955348360@g.us"),
+            self.api.sending.send_message("79001234567@c.us", "Message text"),
+            self.api.sending.send_message("79001234567@c.us", "Message text")
+        )
+        self.assertEqual(self.calls["getGroupData"], 2)
+        self.assertEqual(self.calls["sendMessage"], 2)
+
+        await self.api.account.get_state_instance()
+        self.assertEqual(self.calls["getStateInstance"], 2)
+
+    async def test_cancellation(self):
+        first = asyncio.create_task(self.api.account.get_settings())
+        second = asyncio.create_task(self.api.account.get_settings())
+        await asyncio.sleep(0)
+
+        first.cancel()
+        response = await second
+
+        self.assertEqual(response.code, 200)
+        self.assertEqual(self.calls["getSettings"], 1)
+
+    async def test_opt_out(self):
+        api = AsyncGreenAPI("1101000001", "token", session=self.session, coalesce=False)
+
+        await asyncio.gather(*(api.account.get_state_instance() for _ in range(3)))
+
+        self.assertEqual(self.calls["getStateInstance"], 3)
+        self.assertEqual(api.coalesced, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
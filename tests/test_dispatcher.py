@@ -0,0 +1,39 @@
+import unittest
+
+from async_whatsapp_api_client_python import Dispatcher
+
+
+class DispatcherTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_routing(self):
+        handled = []
+        dispatcher = Dispatcher(fallback=lambda body: handled.append("fallback"))
+
+        @dispatcher.on("incomingMessageReceived", chat_id="11001234567@c.us")
+        async def chat(body: dict) -> None:
+            handled.append("chat")
+
+        @dispatcher.on("incomingMessageReceived", "textMessage")
+        def text(body: dict) -> None:
+            handled.append("text")
+
+        @dispatcher.on(predicate=lambda body: body.get("timestamp", 0) > 100)
+        def late(body: dict) -> None:
+            handled.append("late")
+
+        def message(chat_id: str, type_message: str) -> dict:
+            return {
+                "typeWebhook": "incomingMessageReceived",
+                "senderData": {"chatId": chat_id},
+                "messageData": {"typeMessage": type_message}
+            }
+
+        await dispatcher("incomingMessageReceived", message("11001234567@c.us", "textMessage"))
+        await dispatcher("incomingMessageReceived", message("11007654321@c.us", "textMessage"))
+        await dispatcher("incomingMessageReceived", message("11007654321@c.us", "imageMessage"))
+        await dispatcher("stateInstanceChanged", {"typeWebhook": "stateInstanceChanged", "timestamp": 101})
+
+        self.assertEqual(handled, ["chat", "text", "fallback", "late"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+
+
+class HistorySyncTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "history.sqlite3")
+
+        self.history = {
+            chat_id: [
+                {"type": "incoming", "idMessage": f"{chat_id}-{index}", "timestamp": 1000 + index}
+                for index in range(250)
+            ]
+            for chat_id in ("79001234567@c.us", "79001234568@c.us")
+        }
+        self.counts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            if method == "lastIncomingMessages":
+                return httpx.Response(200, json=[{
+                    "type": "incoming", "idMessage": "79001234567@c.us-249",
+                    "timestamp": 1249, "chatId": "79001234567@c.us"
+                }])
+            if method == "lastOutgoingMessages":
+                return httpx.Response(200, json=[])
+
+            body = json.loads(request.content)
+            self.counts.append(body["count"])
+
+            messages = self.history[body["chatId"]]
+
+            return httpx.Response(200, json=messages[::-1][:body["count"]])
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+    async def test_sync(self):
+        async with self.api.journals.history(self.path, count=50) as history:
+            results = dict([result async for result in history.sync(self.history, rate=100)])
+            self.assertEqual(results, {"79001234567@c.us": 250, "79001234568@c.us": 250})
+            self.assertEqual(sorted(self.counts), [50, 50, 100, 100, 200, 200, 400, 400])
+
+            self.history["79001234567@c.us"].append(
+                {"type": "outgoing", "idMessage": "79001234567@c.us-250", "timestamp": 1250}
+            )
+            self.counts.clear()
+
+            self.assertEqual(await history.sync_chat("79001234567@c.us"), 1)
+            self.assertEqual(self.counts, [50])
+            self.assertEqual(await history.watermark("79001234567@c.us"), 1250)
+
+            messages = await history.messages("79001234567@c.us", since=1249)
+            self.assertEqual([message["idMessage"] for message in messages], [
+                "79001234567@c.us-249", "79001234567@c.us-250"
+            ])
+
+            self.assertEqual(await history.sync_recent(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
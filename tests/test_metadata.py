@@ -0,0 +1,110 @@
+import asyncio
+import gc
+import json
+import unittest
+from collections import Counter
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+
+
+class MetadataCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = Counter()
+        self.name = "Green API"
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            self.calls[method] += 1
+            await asyncio.sleep(0.01)
+
+            if method == "getGroupData":
+                body = json.loads(request.content)
+                return httpx.Response(200, json={"groupId": body["groupId"], "participants": []})
+            if method == "getContactInfo":
+                return httpx.Response(200, json={"chatId": "79001234567@c.us", "name": self.name})
+
+            return httpx.Response(200, json={"addParticipant": True})
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+    async def test_coalescing(self):
+        responses = await asyncio.gather(*(
+            self.api.metadata.get_group_data("120363025955348359@g.us")
+            for _ in range(10)
+        ))
+        self.assertEqual({response.data["groupId"] for response in responses}, {"120363025955348359@g.us"})
+        self.assertEqual(self.calls["getGroupData"], 1)
+
+        await self.api.metadata.get_group_data("120363025955348359@g.us")
+        self.assertEqual(self.calls["getGroupData"], 1)
+
+        await self.api.groups.add_group_participant("120363025955348359@g.us", "79001234567@c.us")
+        await self.api.metadata.get_group_data("120363025955348359@g.us")
+        self.assertEqual(self.calls["getGroupData"], 2)
+
+    async def test_notifications(self):
+        handled = []
+        handle = self.api.webhooks._with_hooks(lambda type_webhook, body: handled.append(type_webhook))
+
+        await self.api.metadata.get_group_data("120363025955348359@g.us")
+        await self.api.metadata.get_contact_info("79001234567@c.us")
+
+        await handle("incomingMessageReceived", {
+            "senderData": {"chatId": "120363025955348359@g.us", "senderName": "Green API"},
+            "messageData": {"typeMessage": "textMessage"}
+        })
+        await handle("incomingMessageReceived", {
+            "senderData": {"chatId": "79001234567@c.us", "senderName": "Green API"},
+            "messageData": {"typeMessage": "textMessage"}
+        })
+        await self.api.metadata.get_group_data("120363025955348359@g.us")
+        await self.api.metadata.get_contact_info("79001234567@c.us")
+        self.assertEqual((self.calls["getGroupData"], self.calls["getContactInfo"]), (1, 1))
+
+        await handle("incomingMessageReceived", {
+            "senderData": {"chatId": "120363025955348359@g.us", "senderName": "Green API"},
+            "messageData": {"typeMessage": "notificationMessage"}
+        })
+        await handle("incomingMessageReceived", {
+            "senderData": {"chatId": "79001234567@c.us", "senderName": "New name"},
+            "messageData": {"typeMessage": "textMessage"}
+        })
+        await self.api.metadata.get_group_data("120363025955348359@g.us")
+        await self.api.metadata.get_contact_info("79001234567@c.us")
+        self.assertEqual((self.calls["getGroupData"], self.calls["getContactInfo"]), (2, 2))
+
+        self.assertEqual(len(handled), 4)
+
+    async def test_cancelled_callers(self):
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            raise_errors=True
+        )
+
+        caller = asyncio.create_task(api.metadata.get_group_data("120363025955348359@g.us"))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0.05)
+
+        del caller
+        gc.collect()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,7 +18,9 @@ class MethodsTestCase(unittest.IsolatedAsyncioTestCase):
     async def test_methods(self):
         with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as mock_request:
             mock_request.return_value = AsyncMock(
-                status_code=200, text=self.response_text,
+                status_code=200,
+                text=self.response_text,
+                content=self.response_text.encode(),
             )
 
             methods = [
@@ -39,7 +41,10 @@ class MethodsTestCase(unittest.IsolatedAsyncioTestCase):
                 self.assertEqual(response.code, 200)
                 self.assertEqual(response.data, {"example": {"key": "value"}})
 
-            self.assertEqual(mock_request.call_count, len(methods))
+            # Identical concurrent requests of read-only methods share one call.
+            self.assertEqual(
+                mock_request.call_count, len(methods) - sum(api.coalesced.values())
+            )
 
     @property
     def response_text(self) -> str:
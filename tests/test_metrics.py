@@ -0,0 +1,83 @@
+import unittest
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+from async_whatsapp_api_client_python.metrics import (
+    Instrument, PrometheusMetrics, RequestMetrics
+)
+from async_whatsapp_api_client_python.retry import RetryPolicy
+
+BODY = b'{"urlFile": "https://example.com/file"}'
+
+
+class Recorder(Instrument):
+    def __init__(self):
+        self.started_methods = []
+        self.finished_metrics = []
+
+    def started(self, id_instance, method):
+        self.started_methods.append(method)
+
+    def finished(self, metrics):
+        self.finished_metrics.append(metrics)
+
+
+class MetricsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.failures = [httpx.Response(503)]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            if method == "getStateInstance" and self.failures:
+                return self.failures.pop(0)
+            if method == "getSettings":
+                raise httpx.ConnectTimeout("Timed out")
+
+            return httpx.Response(200, content=BODY)
+
+        self.recorder = Recorder()
+        self.metrics = PrometheusMetrics(buckets=(1.0,))
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            retry_policy=RetryPolicy(backoff=0, attempts=2),
+            instruments=[self.recorder, self.metrics]
+        )
+
+    async def test_instruments(self):
+        await self.api.account.get_state_instance()
+        await self.api.account.get_settings()
+        await self.api.sending.upload_file(b"data", "file.txt")
+
+        self.assertEqual(
+            self.recorder.started_methods,
+            ["getStateInstance", "getSettings", "uploadFile"]
+        )
+
+        state, settings, upload = self.recorder.finished_metrics
+        self.assertIsInstance(state, RequestMetrics)
+        self.assertEqual((state.status_code, state.attempts), (200, 2))
+        self.assertEqual(state.bytes_received, len(BODY))
+        self.assertIsInstance(settings.error, httpx.ConnectTimeout)
+        self.assertIsNone(settings.status_code)
+        self.assertEqual(upload.status_code, 200)
+        self.assertEqual(upload.bytes_sent, len(b"data"))
+
+    async def test_prometheus(self):
+        await self.api.account.get_state_instance()
+        await self.api.account.get_settings()
+
+        text = self.metrics.render()
+
+        self.assertIn('greenapi_requests_total{method="getStateInstance",status="200"} 1', text)
+        self.assertIn('greenapi_requests_total{method="getSettings",status="error"} 1', text)
+        self.assertIn('greenapi_requests_in_flight{method="getStateInstance"} 0', text)
+        self.assertIn('greenapi_request_duration_seconds_bucket{method="getStateInstance",le="1.0"} 1', text)
+        self.assertIn('greenapi_request_duration_seconds_count{method="getStateInstance"} 1', text)
+        self.assertIn('greenapi_retries_total{method="getStateInstance"} 1', text)
+        self.assertIn('# TYPE greenapi_pool_wait_seconds histogram', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
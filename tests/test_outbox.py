@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+from async_whatsapp_api_client_python.outbox import FAILED, Outbox, PENDING, SENT
+
+
+class OutboxTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "outbox.sqlite3")
+
+        self.sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if body["message"] == "fail":
+                return httpx.Response(400, json={"message": "Bad Request"})
+
+            self.sent.append(body["message"])
+            return httpx.Response(200, json={"idMessage": f"ID{len(self.sent)}"})
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        self.api.logger.disabled = True
+        self.addCleanup(setattr, self.api.logger, "disabled", False)
+
+    async def test_drain(self):
+        async with self.api.sending.outbox(self.path, max_attempts=2, retry_delay=0) as outbox:
+            ids = await outbox.put_many(
+                {"chat_id": "79001234567@c.us", "message": str(index)}
+                for index in range(20)
+            )
+            failed_id = await outbox.put({"chat_id": "79001234567@c.us", "message": "fail"})
+
+            self.assertEqual(await outbox.drain(concurrency=4), 20)
+
+            self.assertEqual(sorted(self.sent, key=int), [str(index) for index in range(20)])
+            self.assertEqual(await outbox.counts(), {PENDING: 0, SENT: 20, FAILED: 1})
+
+            message = await outbox.get(ids[0])
+            self.assertEqual(message.status, SENT)
+            self.assertTrue(message.id_message.startswith("ID"))
+            self.assertEqual(message.message["message"], "0")
+
+            failed = await outbox.get(failed_id)
+            self.assertEqual((failed.status, failed.attempts), (FAILED, 2))
+
+    async def test_resume(self):
+        async with Outbox(self.api, self.path) as outbox:
+            await outbox.put_many(
+                {"chat_id": "79001234567@c.us", "message": str(index)}
+                for index in range(5)
+            )
+
+        async with Outbox(self.api, self.path) as outbox:
+            self.assertEqual((await outbox.counts())[PENDING], 5)
+            self.assertEqual(await outbox.drain(), 5)
+
+        async with Outbox(self.api, self.path) as outbox:
+            self.assertEqual(await outbox.drain(), 0)
+            self.assertEqual(len(self.sent), 5)
+
+    async def test_background(self):
+        async with Outbox(self.api, self.path) as outbox:
+            outbox.start(concurrency=2)
+
+            await outbox.put({"chat_id": "79001234567@c.us", "message": "1"})
+            await outbox.put({"chat_id": "79001234567@c.us", "message": "2"})
+
+            for _ in range(100):
+                if len(self.sent) == 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            await outbox.stop()
+            self.assertEqual((await outbox.counts())[SENT], 2)
+
+    async def test_unknown_method(self):
+        async with Outbox(self.api, self.path) as outbox:
+            outbox.start()
+
+            failed_id = await outbox.put(
+                {"method": "send_mesage", "chat_id": "79001234567@c.us", "message": "1"}
+            )
+            await outbox.put({"chat_id": "79001234567@c.us", "message": "2"})
+
+            for _ in range(100):
+                if self.sent:
+                    break
+                await asyncio.sleep(0.01)
+
+            await outbox.stop()
+            self.assertEqual(await outbox.counts(), {PENDING: 0, SENT: 1, FAILED: 1})
+
+            failed = await outbox.get(failed_id)
+            self.assertEqual((failed.attempts, failed.error), (1, "Unknown sending method: send_mesage."))
+
+
+if __name__ == '__main__':
+    unittest.main()
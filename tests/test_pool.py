@@ -0,0 +1,34 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from async_whatsapp_api_client_python import InstancePool
+
+
+class InstancePoolTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_routing(self):
+        async with InstancePool({"1101000001": "first"}) as pool:
+            pool.add("1101000002", "second")
+
+            first, second = pool["1101000001"], pool["1101000002"]
+
+            self.assertIs(first, pool.get("1101000001"))
+            self.assertIs(first.session, second.session)
+            self.assertEqual(len(pool), 2)
+
+            with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as mock_request:
+                mock_request.return_value = AsyncMock(status_code=200, text="{}", content=b"{}")
+
+                await second.account.get_state_instance()
+
+            self.assertEqual(
+                mock_request.call_args.kwargs["url"],
+                "https://api.green-api.com/waInstance1101000002/getStateInstance/second"
+            )
+
+            pool.remove("1101000001")
+
+            self.assertNotIn("1101000001", pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import hashlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+
+CONTENT = bytes(range(256)) * 1000
+ETAG = '"5d8c72a5edda8d6a"'
+
+
+class ReceivingTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ranges = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/downloadFile/token"):
+                return httpx.Response(200, json={"downloadUrl": "https://sw-media-out.storage.example/file.bin"})
+
+            headers = {"ETag": ETAG}
+            range_header = request.headers.get("Range")
+            self.ranges.append(range_header)
+            if range_header and request.headers.get("If-Range") == ETAG:
+                offset = int(range_header.removeprefix("bytes=").removesuffix("-"))
+                if offset >= len(CONTENT):
+                    headers["Content-Range"] = f"bytes */{len(CONTENT)}"
+                    return httpx.Response(416, headers=headers)
+
+                headers["Content-Range"] = f"bytes {offset}-{len(CONTENT) - 1}/{len(CONTENT)}"
+                return httpx.Response(206, headers=headers, content=CONTENT[offset:])
+
+            return httpx.Response(200, headers=headers, content=CONTENT)
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        self.checksum = hashlib.sha256(CONTENT).hexdigest()
+
+    async def test_download_media(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "file.bin"
+            path.with_name("file.bin.part").write_bytes(CONTENT[:1000])
+            path.with_name("file.bin.part.validator").write_text(ETAG)
+
+            response = await self.api.receiving.download_media(
+                "11001234567@c.us", "BAE5F4886F6F2D05", path, self.checksum, chunk_size=4096
+            )
+
+            self.assertEqual(response.code, 200)
+            self.assertEqual(path.read_bytes(), CONTENT)
+            self.assertFalse(path.with_name("file.bin.part").exists())
+            self.assertFalse(path.with_name("file.bin.part.validator").exists())
+            self.assertEqual(self.ranges, ["bytes=1000-"])
+
+            response = await self.api.receiving.download_media(
+                "11001234567@c.us", "BAE5F4886F6F2D05", path, "0" * 64
+            )
+
+            self.assertIsNone(response.code)
+            self.assertFalse(path.exists())
+
+    async def test_stale_part(self):
+        # Parts of another file, of a changed file and without the
+        # validator are downloaded again.
+        for part, validator, ranges in (
+                (CONTENT + b"stale", ETAG, [f"bytes={len(CONTENT) + 5}-", None]),
+                (CONTENT[:1000], '"0000000000000000"', ["bytes=1000-"]),
+                (CONTENT[:1000], None, [None])
+        ):
+            with self.subTest(validator=validator, ranges=ranges), tempfile.TemporaryDirectory() as directory:
+                self.ranges.clear()
+                path = Path(directory) / "file.bin"
+                path.with_name("file.bin.part").write_bytes(part)
+                if validator is not None:
+                    path.with_name("file.bin.part.validator").write_text(validator)
+
+                response = await self.api.receiving.download_media(
+                    "11001234567@c.us", "BAE5F4886F6F2D05", path
+                )
+
+                self.assertEqual(response.code, 200)
+                self.assertEqual(path.read_bytes(), CONTENT)
+                self.assertEqual(self.ranges, ranges)
+
+    async def test_unknown_algorithm(self):
+        with tempfile.TemporaryDirectory() as directory:
+            response = await self.api.receiving.download_media(
+                "11001234567@c.us", "BAE5F4886F6F2D05", Path(directory) / "file.bin",
+                self.checksum, algorithm="sha257"
+            )
+
+        self.assertIsNone(response.code)
+
+    async def test_download_media_many(self):
+        files = [io.BytesIO() for _ in range(5)]
+
+        results = [
+            response.code
+            async for _, response in self.api.receiving.download_media_many(
+                (("11001234567@c.us", str(number), file) for number, file in enumerate(files)),
+                concurrency=2
+            )
+        ]
+
+        self.assertEqual(results, [200] * 5)
+        self.assertTrue(all(file.getvalue() == CONTENT for file in files))
+
+
+if __name__ == '__main__':
+    unittest.main()
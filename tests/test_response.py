@@ -0,0 +1,56 @@
+import json
+import unittest
+
+from async_whatsapp_api_client_python.response import Response, iter_json_array
+
+
+async def chunks(content: bytes, size: int):
+    for index in range(0, len(content), size):
+        yield content[index:index + size]
+
+
+class ResponseTestCase(unittest.TestCase):
+    def test_lazy_decoding(self):
+        response = Response(200, b'{"idMessage": "3EB0C767D097B7C7C030"')
+
+        self.assertEqual(response.code, 200)
+        self.assertIsNone(response.error)
+        self.assertRaises(ValueError, lambda: response.data)
+
+        response = Response(200, '{"idMessage": "3EB0C767D097B7C7C030"}')
+
+        self.assertEqual(response.data, {"idMessage": "3EB0C767D097B7C7C030"})
+        self.assertIs(response.data, response.data)
+
+    def test_error(self):
+        response = Response(None, "Request was failed with error: timeout.")
+
+        self.assertIsNone(response.data)
+        self.assertEqual(response.error, "Request was failed with error: timeout.")
+
+
+class IterJsonArrayTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_chunks(self):
+        items = [
+            {"idMessage": "3EB0C767D097B7C7C030", "textMessage": "Привет"},
+            -1500.25,
+            12345,
+            "\"quoted\", [brackets]",
+            [],
+            None,
+            True
+        ]
+        content = json.dumps(items, ensure_ascii=False, indent=2).encode()
+
+        for size in range(1, 12):
+            self.assertEqual([item async for item in iter_json_array(chunks(content, size))], items)
+
+    async def test_invalid(self):
+        with self.assertRaises(ValueError):
+            [item async for item in iter_json_array(chunks(b'{"idMessage": ""}', 4))]
+        with self.assertRaises(ValueError):
+            [item async for item in iter_json_array(chunks(b'[1, 2', 4))]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from collections import Counter
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+from async_whatsapp_api_client_python.retry import RetryPolicy, parse_retry_after
+
+
+class RetryTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = Counter()
+        self.failures = {
+            "getStateInstance": [httpx.Response(503)],
+            "sendMessage": [httpx.Response(503)],
+            "sendPoll": [httpx.Response(429, headers={"Retry-After": "0"})],
+            "sendLocation": [httpx.ConnectError("Connection refused")]
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            self.calls[method] += 1
+
+            failures = self.failures.get(method)
+            if failures:
+                failure = failures.pop(0)
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+
+            return httpx.Response(200, json={"idMessage": "BAE5F4886F6F2D05"})
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            retry_policy=RetryPolicy(backoff=0)
+        )
+        self.attempts = []
+        self.api.attempt_hooks.append(self.attempts.append)
+
+    async def test_retries(self):
+        self.assertEqual((await self.api.account.get_state_instance()).code, 200)
+        self.assertEqual((await self.api.sending.send_message("", "")).code, 503)
+        self.assertEqual((await self.api.sending.send_poll("", "", [])).code, 200)
+        self.assertEqual((await self.api.sending.send_location("", 0.0, 0.0)).code, 200)
+
+        self.assertEqual(self.calls, Counter({
+            "getStateInstance": 2, "sendMessage": 1, "sendPoll": 2, "sendLocation": 2
+        }))
+        self.assertEqual(
+            [(attempt.method, attempt.attempt, attempt.status_code) for attempt in self.attempts[:2]],
+            [("getStateInstance", 0, 503), ("getStateInstance", 1, 200)]
+        )
+        self.assertEqual(self.attempts[3].delay, 0)
+
+    async def test_override(self):
+        with self.api.retrying(RetryPolicy(methods={"sendMessage"}, backoff=0)):
+            self.assertEqual((await self.api.sending.send_message("", "")).code, 200)
+
+        with self.api.retrying(None):
+            self.assertEqual((await self.api.account.get_state_instance()).code, 503)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("2"), 2.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+if __name__ == '__main__':
+    unittest.main()
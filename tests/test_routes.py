@@ -0,0 +1,33 @@
+import unittest
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+
+
+class RoutesTestCase(unittest.TestCase):
+    def test_routes(self):
+        api = AsyncGreenAPI("1101000001", "token")
+
+        self.assertEqual(
+            api.routes["sendMessage"],
+            "https://api.green-api.com/waInstance1101000001/sendMessage/token"
+        )
+        self.assertEqual(
+            api.routes["uploadFile"],
+            "https://media.green-api.com/waInstance1101000001/uploadFile/token"
+        )
+
+    def test_invalidation(self):
+        api = AsyncGreenAPI("1101000001", "token")
+        api.routes["getSettings"]
+
+        api.api_token_instance = "other"
+        api.host = "http://localhost"
+
+        self.assertEqual(
+            api.routes["getSettings"],
+            "http://localhost/waInstance1101000001/getSettings/other"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
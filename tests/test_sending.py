@@ -0,0 +1,85 @@
+import asyncio
+import json
+import time
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+from async_whatsapp_api_client_python.ratelimit import TokenBucket
+from async_whatsapp_api_client_python.response import Response
+from async_whatsapp_api_client_python.retry import RetryPolicy
+
+
+class SendingTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_send_many(self):
+        in_flight = max_in_flight = 0
+        calls = Counter()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            chat_id = json.loads(request.content)["chatId"]
+            calls[chat_id] += 1
+
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+            if chat_id == "11001234561@c.us" and calls[chat_id] == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            if chat_id == "11001234562@c.us":
+                return httpx.Response(502)
+            return httpx.Response(200, json={"idMessage": chat_id})
+
+        api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            retry_policy=RetryPolicy(backoff=0)
+        )
+        chat_ids = [f"1100123456{number}@c.us" for number in range(10)]
+
+        results = {
+            message["chat_id"]: response.code
+            async for message, response in api.sending.broadcast(
+                chat_ids, "Message text", concurrency=3
+            )
+        }
+
+        self.assertEqual(results, {
+            chat_id: 502 if chat_id == "11001234562@c.us" else 200 for chat_id in chat_ids
+        })
+        # Throttled messages are retried, messages failed with server
+        # errors are not, as they may have been sent.
+        self.assertEqual(calls["11001234561@c.us"], 2)
+        self.assertEqual(calls["11001234562@c.us"], 1)
+        self.assertLessEqual(max_in_flight, 3)
+
+    async def test_rate(self):
+        api = AsyncGreenAPI("", "")
+
+        async def send_message(chat_id: str, message: str) -> Response:
+            return Response(200, "{}")
+
+        started = time.monotonic()
+        with patch.object(api.sending, "send_message", send_message):
+            async for _ in api.sending.send_many((
+                {"chat_id": "11001234567@c.us", "message": str(number)}
+                for number in range(15)
+            ), rate=50, burst=5):
+                pass
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_rate_update(self):
+        limiter = TokenBucket(40)
+
+        for code, rate in ((429, 20), (None, 10), (502, 5), (400, 5), (200, 7)):
+            limiter.update(code)
+            self.assertEqual(limiter.rate, rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import json
+import unittest
+from collections import Counter
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+from async_whatsapp_api_client_python.tools.serviceMethods import normalize_phone_number
+
+
+class ServiceMethodsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = Counter()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            phone_number = json.loads(request.content)["phoneNumber"]
+            self.calls[phone_number] += 1
+
+            return httpx.Response(200, json={"existsWhatsapp": phone_number % 2 == 0})
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+    async def check(self, phone_numbers, **options):
+        return {
+            phone_number: response.data["existsWhatsapp"]
+            async for phone_number, response in
+            self.api.service_methods.check_whatsapp_many(phone_numbers, **options)
+        }
+
+    async def test_check_whatsapp_many(self):
+        phone_numbers = [
+            "+7 (900) 123-45-67", 79001234567, "79001234567@c.us", "79001234568", "-"
+        ]
+
+        results = await self.check(phone_numbers, concurrency=2, negative_ttl=0)
+        self.assertEqual(results, {79001234567: False, 79001234568: True})
+        self.assertEqual(self.calls, Counter({79001234567: 1, 79001234568: 1}))
+
+        # Negative results expire sooner.
+        self.assertEqual(await self.check(phone_numbers), results)
+        self.assertEqual(self.calls, Counter({79001234567: 2, 79001234568: 1}))
+
+    def test_normalize_phone_number(self):
+        self.assertEqual(normalize_phone_number("+7 900 123-45-67"), 79001234567)
+        self.assertEqual(normalize_phone_number("79001234567@c.us"), 79001234567)
+        self.assertEqual(normalize_phone_number(79001234567), 79001234567)
+        self.assertIsNone(normalize_phone_number("unknown"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+from collections import Counter
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+
+
+class AccountStateTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = Counter()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            self.calls[method] += 1
+
+            if method == "getStateInstance":
+                return httpx.Response(200, json={"stateInstance": "authorized"})
+            if method == "getStatusInstance":
+                return httpx.Response(200, json={"statusInstance": "online"})
+            if method == "getSettings":
+                return httpx.Response(200, json={"delaySendMessagesMilliseconds": 1000})
+
+            return httpx.Response(200, json={"saveSettings": True})
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        self.state = self.api.account.state
+
+    async def test_get(self):
+        self.assertEqual(self.state.state_instance, (None, None))
+        self.assertIsNone(self.state.state_instance.age)
+
+        self.assertTrue(await self.state.authorized())
+        self.assertTrue(await self.state.authorized())
+        self.assertEqual(self.calls["getStateInstance"], 1)
+        self.assertLess(self.state.state_instance.age, 1)
+
+        await self.state.get_state_instance(max_age=0)
+        self.assertEqual(self.calls["getStateInstance"], 2)
+
+        self.assertEqual(await self.state.get_settings(), {"delaySendMessagesMilliseconds": 1000})
+        await self.api.account.set_settings({"delaySendMessagesMilliseconds": 500})
+        self.assertIsNone(self.state.settings.value)
+        await self.state.get_settings()
+        self.assertEqual(self.calls["getSettings"], 2)
+
+    async def test_notifications(self):
+        handle = self.api.webhooks._with_hooks(lambda type_webhook, body: None)
+
+        await handle("stateInstanceChanged", {"stateInstance": "notAuthorized"})
+        await handle("statusInstanceChanged", {"statusInstance": "offline"})
+
+        self.assertFalse(await self.state.authorized())
+        self.assertEqual(await self.state.get_status_instance(), "offline")
+        self.assertEqual(self.calls["getStateInstance"] + self.calls["getStatusInstance"], 0)
+
+    async def test_refresh(self):
+        self.state.interval = 0.01
+
+        async with self.state:
+            await asyncio.sleep(0.035)
+
+        self.assertGreaterEqual(self.calls["getStateInstance"], 2)
+        self.assertEqual(self.state.status_instance.value, "online")
+        self.assertEqual(self.state.settings.value, {"delaySendMessagesMilliseconds": 1000})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI, GreenAPIError
+
+
+class StreamingTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.messages = [
+            {"type": "incoming", "idMessage": f"3EB0C767D097B7C7C03{index}", "timestamp": 1000 + index}
+            for index in range(100)
+        ]
+        self.sent = 0
+
+        async def stream(content: bytes):
+            for index in range(0, len(content), 64):
+                self.sent = index
+                yield content[index:index + 64]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            method = request.url.path.split("/")[2]
+            if method == "getContacts":
+                return httpx.Response(403, content=b'{"error": "forbidden"}')
+
+            count = json.loads(request.content)["count"]
+            content = json.dumps(self.messages[:count]).encode()
+
+            return httpx.Response(200, content=stream(content))
+
+        self.api = AsyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+    async def test_iter_chat_history(self):
+        messages = []
+        async for message in self.api.journals.iter_chat_history("79001234567@c.us", 100):
+            messages.append(message)
+            # Items are yielded before the whole body is received.
+            if len(messages) == 1:
+                self.assertLess(self.sent, 256)
+
+        self.assertEqual(messages, self.messages)
+
+    async def test_error(self):
+        self.assertEqual([contact async for contact in self.api.service_methods.iter_contacts()], [])
+
+        self.api.raise_errors = True
+        with self.assertRaises(GreenAPIError):
+            [contact async for contact in self.api.service_methods.iter_contacts()]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from async_whatsapp_api_client_python import RetryPolicy, SyncGreenAPI
+
+
+class SyncGreenApiTestCase(unittest.TestCase):
+    def setUp(self):
+        self.threads = set()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.threads.add(threading.current_thread().name)
+            await asyncio.sleep(0.001)
+
+            method = request.url.path.split("/")[2]
+            if method == "getChatHistory":
+                count = json.loads(request.content)["count"]
+                return httpx.Response(200, json=[{"idMessage": str(index)} for index in range(count)])
+
+            return httpx.Response(200, json={"idMessage": "3EB0C767D097B7C7C030"})
+
+        self.api = SyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        self.addCleanup(self.api.close)
+
+    def test_methods(self):
+        response = self.api.sending.send_message("79001234567@c.us", "Message text")
+        self.assertEqual(response.data, {"idMessage": "3EB0C767D097B7C7C030"})
+
+        messages = self.api.journals.iter_chat_history("79001234567@c.us", 3)
+        self.assertEqual([message["idMessage"] for message in messages], ["0", "1", "2"])
+
+        results = list(self.api.sending.send_many(
+            [{"chat_id": "79001234567@c.us", "message": "Message text"}] * 3
+        ))
+        self.assertEqual([response.code for _, response in results], [200] * 3)
+
+        self.assertEqual(self.api.sending.send_message.__name__, "send_message")
+
+    def test_threads(self):
+        def send(index: int) -> int:
+            return self.api.sending.send_message("79001234567@c.us", f"Message {index}").code
+
+        with ThreadPoolExecutor(8) as executor:
+            codes = list(executor.map(send, range(200)))
+
+        self.assertEqual(codes, [200] * 200)
+        self.assertEqual(self.threads, {"green-api-event-loop"})
+
+    def test_retrying(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(500 if len(calls) == 1 else 200, json={})
+
+        api = SyncGreenAPI(
+            "1101000001", "token",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            loop_thread=self.api._loop_thread
+        )
+
+        with api.retrying(RetryPolicy(methods={"sendMessage"}, backoff=0)):
+            response = api.sending.send_message("79001234567@c.us", "Message text")
+
+        self.assertEqual(response.code, 200)
+        self.assertEqual(len(calls), 2)
+
+        response = api.sending.send_message("79001234567@c.us", "Message text")
+        self.assertEqual(len(calls), 3)
+
+    def test_loop_thread(self):
+        async def call():
+            return self.api.account.get_settings()
+
+        with self.assertRaises(RuntimeError):
+            self.api._loop_thread.run(call())
+
+
+if __name__ == '__main__':
+    unittest.main()
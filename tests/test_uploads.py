@@ -0,0 +1,51 @@
+import io
+import unittest
+from email.parser import BytesParser
+from pathlib import Path
+
+from async_whatsapp_api_client_python.uploads import Upload, encode_multipart
+
+BASE_DIR = Path(__file__).parent.parent
+
+path = BASE_DIR / "examples/data/rates.png"
+
+
+class UploadsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_sources(self):
+        content = path.read_bytes()
+
+        async def chunks():
+            yield content[:100]
+            yield content[100:]
+
+        for source in (path, str(path), content, io.BytesIO(content), chunks()):
+            upload = Upload(source, chunk_size=1000)
+
+            self.assertEqual(b"".join([chunk async for chunk in upload]), content)
+
+        self.assertEqual(Upload(path).content_type, "image/png")
+        self.assertEqual(await Upload(path).size(), len(content))
+
+    async def test_multipart(self):
+        content = path.read_bytes()
+
+        headers, stream = await encode_multipart(
+            {"chatId": "11001234567@c.us", "caption": "Rates"}, "file", Upload(path)
+        )
+        body = b"".join([chunk async for chunk in stream])
+
+        self.assertEqual(int(headers["Content-Length"]), len(body))
+
+        message = BytesParser().parsebytes(
+            f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        chat_id, caption, file = message.get_payload()
+
+        self.assertEqual(chat_id.get_payload(), "11001234567@c.us")
+        self.assertEqual(caption.get_payload(), "Rates")
+        self.assertEqual(file.get_filename(), "rates.png")
+        self.assertEqual(file.get_payload(decode=True), content)
+
+
+if __name__ == '__main__':
+    unittest.main()
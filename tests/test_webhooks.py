@@ -0,0 +1,198 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from async_whatsapp_api_client_python.API import AsyncGreenAPI
+from async_whatsapp_api_client_python.response import Response
+from async_whatsapp_api_client_python.server import WebhookServer
+from async_whatsapp_api_client_python.tools.webhooks import AckPipeline
+
+
+class WebhooksTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_consuming(self):
+        api = AsyncGreenAPI("", "")
+        notifications = [
+            Response(200, (
+                f'{{"receiptId": {receipt_id}, "body": '
+                f'{{"typeWebhook": "incomingMessageReceived"}}}}'
+            )) for receipt_id in range(1, 21)
+        ]
+        handled = []
+
+        async def receive_notification() -> Response:
+            await asyncio.sleep(0)
+            if notifications:
+                return notifications.pop(0)
+
+            api.webhooks.stop_receiving_notifications()
+            return Response(200, "null")
+
+        async def handler(type_webhook: str, body: dict) -> None:
+            await asyncio.sleep(0.05)
+            handled.append(type_webhook)
+
+        with (
+            patch.object(api.receiving, "receive_notification", receive_notification),
+            patch.object(api.receiving, "delete_notification", new_callable=AsyncMock) as delete_notification
+        ):
+            delete_notification.return_value = Response(200, '{"result": true}')
+
+            await asyncio.wait_for(
+                api.webhooks.start_receiving_notifications(
+                    handler, workers=10, ack_mode="on_receive"
+                ), timeout=0.5
+            )
+
+        self.assertEqual(len(handled), 20)
+        self.assertEqual(
+            sorted(call.args[0] for call in delete_notification.call_args_list),
+            list(range(1, 21))
+        )
+
+    async def test_head_of_queue(self):
+        for ack_mode, workers in (
+                ("after_handler", 1),
+                ("after_handler", 8),
+                ("on_receive", 8)
+        ):
+            with self.subTest(ack_mode=ack_mode, workers=workers):
+                api = AsyncGreenAPI("", "")
+                # The first notification is returned until it is deleted.
+                queue = list(range(1, 11))
+                received = []
+                handled = []
+
+                async def receive_notification() -> Response:
+                    await asyncio.sleep(0.001)
+                    if not queue:
+                        api.webhooks.stop_receiving_notifications()
+                        return Response(200, "null")
+
+                    received.append(queue[0])
+                    return Response(200, (
+                        f'{{"receiptId": {queue[0]}, "body": '
+                        f'{{"typeWebhook": "incomingMessageReceived", "receiptId": {queue[0]}}}}}'
+                    ))
+
+                async def delete_notification(receipt_id: int) -> Response:
+                    await asyncio.sleep(0.001)
+                    queue.remove(receipt_id)
+                    return Response(200, '{"result": true}')
+
+                async def handler(type_webhook: str, body: dict) -> None:
+                    await asyncio.sleep(0.001)
+                    handled.append(body["receiptId"])
+
+                with (
+                    patch.object(api.receiving, "receive_notification", receive_notification),
+                    patch.object(api.receiving, "delete_notification", delete_notification)
+                ):
+                    await asyncio.wait_for(
+                        api.webhooks.start_receiving_notifications(
+                            handler, workers, ack_mode=ack_mode
+                        ), timeout=1
+                    )
+
+                self.assertEqual(received, list(range(1, 11)))
+                self.assertEqual(sorted(handled), list(range(1, 11)))
+
+    async def test_handler_errors(self):
+        # The handler of notification 2 fails the given number of times.
+        for ack_mode, failures, attempts in (
+                ("after_handler", 1, [1, 2, 3]),
+                ("after_success", 1, [1, 2, 2, 3]),
+                ("after_success", 10, [1, 2, 2, 2, 3])
+        ):
+            with self.subTest(ack_mode=ack_mode, failures=failures):
+                api = AsyncGreenAPI("", "")
+                queue = [1, 2, 3]
+                handled = []
+                deleted = []
+
+                async def receive_notification() -> Response:
+                    await asyncio.sleep(0)
+                    if not queue:
+                        api.webhooks.stop_receiving_notifications()
+                        return Response(200, "null")
+
+                    return Response(200, (
+                        f'{{"receiptId": {queue[0]}, "body": '
+                        f'{{"typeWebhook": "incomingMessageReceived", "receiptId": {queue[0]}}}}}'
+                    ))
+
+                async def delete_notification(receipt_id: int) -> Response:
+                    queue.remove(receipt_id)
+                    deleted.append(receipt_id)
+                    return Response(200, '{"result": true}')
+
+                def handler(type_webhook: str, body: dict) -> None:
+                    handled.append(body["receiptId"])
+                    if body["receiptId"] == 2 and handled.count(2) <= failures:
+                        raise RuntimeError("boom")
+
+                with (
+                    patch.object(api.receiving, "receive_notification", receive_notification),
+                    patch.object(api.receiving, "delete_notification", delete_notification),
+                    self.assertLogs("whatsapp-api-client-python", "ERROR")
+                ):
+                    await asyncio.wait_for(
+                        api.webhooks.start_receiving_notifications(
+                            handler, ack_mode=ack_mode, max_attempts=3, retry_delay=0
+                        ), timeout=1
+                    )
+
+                self.assertEqual(handled, attempts)
+                self.assertEqual(deleted, [1, 2, 3])
+
+    async def test_ack_retries(self):
+        api = AsyncGreenAPI("", "")
+        acks = AckPipeline(api.receiving, retries=2, retry_delay=0)
+        acks.add(1)
+
+        with patch.object(api.receiving, "delete_notification", new_callable=AsyncMock) as delete_notification:
+            delete_notification.side_effect = [
+                Response(None, "Request was failed with error: timeout."),
+                Response(200, '{"result": true}')
+            ]
+
+            acks.ack(1)
+            await acks.flush()
+
+        self.assertEqual(delete_notification.call_count, 2)
+        self.assertNotIn(1, acks)
+
+    async def test_webhook_server(self):
+        handled = []
+        server = WebhookServer(
+            lambda type_webhook, body: handled.append(body["idMessage"]),
+            "127.0.0.1", 0, "/webhooks", token="secret"
+        )
+        await server.start()
+
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+            notification = {"typeWebhook": "incomingMessageReceived", "idMessage": "1"}
+            headers = {"Authorization": "Bearer secret"}
+
+            response = await client.post("/webhooks", json=notification, headers=headers)
+            self.assertEqual(response.status_code, 200)
+
+            response = await client.post("/webhooks", json=notification)
+            self.assertEqual(response.status_code, 401)
+
+            response = await client.post("/webhooks", content=b"{", headers=headers)
+            self.assertEqual(response.status_code, 400)
+
+            response = await client.post(
+                "/webhooks", json=notification, headers={**headers, "X-Padding": "x" * 70000}
+            )
+            self.assertEqual(response.status_code, 431)
+
+        await server.stop()
+
+        self.assertEqual(handled, ["1"])
+
+
+if __name__ == '__main__':
+    unittest.main()